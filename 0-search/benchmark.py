@@ -0,0 +1,70 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from maze import Maze
+
+
+def open_rooms(rooms, room, seed=0):
+    """
+    Returns the text of a square maze of `rooms` x `rooms` open rooms,
+    each `room` cells wide and joined to its neighbors by single doorways.
+    """
+    rng = random.Random(seed)
+    size = rooms * (room + 1) - 1
+    rows = [[" "] * size for _ in range(size)]
+
+    # Walls between rooms, with one doorway into each neighboring room
+    for k in range(room, size, room + 1):
+        for i in range(size):
+            rows[i][k] = "#"
+            rows[k][i] = "#"
+        for start in range(0, size, room + 1):
+            rows[k][rng.randrange(start, start + room)] = " "
+            rows[rng.randrange(start, start + room)][k] = " "
+
+    rows[0][0] = "A"
+    rows[size - 1][size - 1] = "B"
+    return "\n".join("".join(row) for row in rows)
+
+
+def benchmark(filename, strategies):
+    """Yields (strategy, states explored, solution length, seconds)."""
+    m = Maze(filename)
+    for strategy in strategies:
+        start = time.perf_counter()
+        m.solve(strategy)
+        elapsed = time.perf_counter() - start
+        yield strategy, m.num_explored, len(m.solution[0]), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare search strategies on generated open-room maps."
+    )
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--room", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--strategies", nargs="+", default=["bfs", "astar", "jps"]
+    )
+    args = parser.parse_args()
+
+    contents = open_rooms(args.rooms, args.room, args.seed)
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+        f.write(contents)
+    try:
+        print(f"{args.rooms} x {args.rooms} rooms of {args.room} x {args.room}")
+        print(f"{'Strategy':<15}{'Explored':>10}{'Length':>10}{'Seconds':>10}")
+        for strategy, explored, length, elapsed in benchmark(
+            f.name, args.strategies
+        ):
+            print(f"{strategy:<15}{explored:>10}{length:>10}{elapsed:>10.3f}")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
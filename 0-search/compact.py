@@ -0,0 +1,314 @@
+"""
+Compact maze representation for very large maps.
+
+Walls are kept one byte per cell in a flat bytearray and cells are
+addressed by integer index (row * width + col), so a 10k x 10k maze
+needs about 100MB rather than gigabytes of nested lists of bools.
+Maze files are memory-mapped and translated into the grid line by line.
+"""
+
+import argparse
+import bisect
+import heapq
+import itertools
+import mmap
+import os
+
+from array import array
+from collections import deque
+
+from maze import Maze
+
+# Translation table mapping maze file bytes to 1 (wall) or 0 (open)
+WALLS = bytes(0 if chr(byte) in " AB" else 1 for byte in range(256))
+
+# Strategies searched over flat cell indices; the rest need the Node-based
+# search of `Maze`, which does not fit in memory for the mazes this is for
+STRATEGIES = ("dfs", "bfs", "greedy", "astar")
+
+# Actions in the order of the direction codes 1-4 stored during search
+ACTIONS = ("up", "down", "left", "right")
+
+# Search state kept per cell: the low bits hold the direction code of
+# the move that reached the cell (or START), the high bit marks it explored
+DIRECTION = 0b0111
+START = 0b0101
+EXPLORED = 0b1000
+
+
+class Grid:
+    """
+    Maze walls, one byte per cell in row-major order.
+
+    Indexing works like the nested lists used by `Maze`: `grid[i]` is a
+    zero-copy view of row i, so `grid[i][j]` is truthy for a wall.
+    """
+
+    def __init__(self, height, width):
+        self.height = height
+        self.width = width
+        self.cells = bytearray(height * width)
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.height:
+            raise IndexError("row out of range")
+        start = i * self.width
+        return memoryview(self.cells)[start:start + self.width]
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+        walls = np.frombuffer(self.cells, dtype=np.uint8)
+        return walls.reshape(self.height, self.width).astype(dtype or np.uint8)
+
+    def fill_row(self, i, line):
+        """Marks the walls of row i given the bytes of its line in a file."""
+        start = i * self.width
+        self.cells[start:start + len(line)] = line.translate(WALLS)
+
+
+class ExploredCells:
+    """Read-only set-like view of the cells explored by a compact search."""
+
+    def __init__(self, state, width):
+        self.state = state
+        self.width = width
+
+    def __contains__(self, cell):
+        i, j = cell
+        return bool(self.state[i * self.width + j] & EXPLORED)
+
+    def __iter__(self):
+        for index, value in enumerate(self.state):
+            if value & EXPLORED:
+                yield divmod(index, self.width)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class CompactMaze(Maze):
+
+    def __init__(self, filename):
+        with open(filename, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                raise Exception("maze must have exactly one start point")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as contents:
+                self.load(contents)
+        self.solution = None
+        self.landmarks = None
+
+
+    def load(self, contents):
+        """
+        Fills the maze from the bytes of a maze file.
+
+        Line offsets are found in a single pass over `contents` (usually
+        a memory map) and each line is translated straight into the wall
+        grid, so the file is never copied as a whole.
+        """
+
+        # Find where each line starts and ends
+        starts = array("q")
+        ends = array("q")
+        self.width = 0
+        position = 0
+        while position < len(contents):
+            end = contents.find(b"\n", position)
+            if end == -1:
+                end = len(contents)
+            starts.append(position)
+            position = end + 1
+            if end > starts[-1] and contents[end - 1] == ord("\r"):
+                end -= 1
+            ends.append(end)
+            self.width = max(self.width, end - starts[-1])
+        self.height = len(starts)
+
+        # Validate start and goal
+        self.start = self.locate(contents, b"A", starts, ends)
+        if self.start is None:
+            raise Exception("maze must have exactly one start point")
+        self.goal = self.locate(contents, b"B", starts, ends)
+        if self.goal is None:
+            raise Exception("maze must have exactly one goal")
+
+        # Keep track of walls
+        self.walls = Grid(self.height, self.width)
+        for i in range(self.height):
+            self.walls.fill_row(i, contents[starts[i]:ends[i]])
+
+
+    def locate(self, contents, char, starts, ends):
+        """Returns the only cell holding `char`, or None if not exactly one."""
+        position = contents.find(char)
+        if position == -1 or contents.find(char, position + 1) != -1:
+            return None
+        i = bisect.bisect_right(starts, position) - 1
+        j = position - starts[i]
+        return (i, j) if position < ends[i] else None
+
+
+    def index(self, cell):
+        """Returns the flat index of cell (i, j)."""
+        return cell[0] * self.width + cell[1]
+
+
+    def cell(self, index):
+        """Returns the cell (i, j) at a flat index."""
+        return divmod(index, self.width)
+
+
+    def adjacent(self, index):
+        """Yields (direction code, index) pairs for open neighboring cells."""
+        walls = self.walls.cells
+        width = self.width
+        row, col = divmod(index, width)
+        if row > 0 and not walls[index - width]:
+            yield 1, index - width
+        if row < self.height - 1 and not walls[index + width]:
+            yield 2, index + width
+        if col > 0 and not walls[index - 1]:
+            yield 3, index - 1
+        if col < width - 1 and not walls[index + 1]:
+            yield 4, index + 1
+
+
+    def solve(self, strategy="bfs", start=None, goal=None):
+        """
+        Finds a solution to maze, if one exists.
+
+        Searches run over flat cell indices, with parents and explored
+        cells tracked in one byte per cell. Only STRATEGIES are supported.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"compact mazes do not support the {strategy!r} strategy"
+            )
+        start = self.start if start is None else tuple(start)
+        goal = self.goal if goal is None else tuple(goal)
+        self.validate(start)
+        self.validate(goal)
+
+        self.num_explored = 0
+
+        # Search state of every cell; zero means not yet reached
+        state = bytearray(self.height * self.width)
+        self.explored = ExploredCells(state, self.width)
+
+        start = self.index(start)
+        goal = self.index(goal)
+        state[start] = START
+        if strategy in ("bfs", "dfs"):
+            found = self.search_queue(state, start, goal, strategy == "bfs")
+        else:
+            found = self.search_heap(state, start, goal, strategy == "astar")
+        if not found:
+            raise Exception("no solution")
+        self.solution = self.trace(state, goal)
+
+
+    def search_queue(self, state, start, goal, bfs):
+        """
+        Breadth- or depth-first search from `start`, recording how each
+        cell was reached in `state`. Returns True once `goal` is reached.
+        """
+        frontier = deque([start])
+        remove = frontier.popleft if bfs else frontier.pop
+
+        while frontier:
+            index = remove()
+            self.num_explored += 1
+
+            # If cell is the goal, then we have a solution
+            if index == goal:
+                return True
+
+            # Mark cell as explored and add unreached neighbors to frontier
+            state[index] |= EXPLORED
+            for direction, neighbor in self.adjacent(index):
+                if not state[neighbor]:
+                    state[neighbor] = direction
+                    frontier.append(neighbor)
+
+        return False
+
+
+    def search_heap(self, state, start, goal, astar):
+        """
+        Greedy best-first or A* search from `start` by Manhattan distance,
+        recording how each cell was reached in `state`. Returns True once
+        `goal` is reached.
+
+        Frontier entries are tuples of ints rather than nodes: a cell's
+        cost is fixed when it is first reached, as in `Maze`, so it travels
+        in the entry. Ties break as `GreedyFrontier` and `AStarFrontier`
+        break them, so both backends explore the same cells.
+        """
+        width = self.width
+        goal_row, goal_col = divmod(goal, width)
+
+        # Cost of each step; greedy search orders by distance alone
+        step = 1 if astar else 0
+
+        # Entries are (priority, cost, insertion order, index)
+        counter = itertools.count()
+        row, col = divmod(start, width)
+        distance = abs(row - goal_row) + abs(col - goal_col)
+        frontier = [(distance, 0, next(counter), start)]
+
+        while frontier:
+            _, cost, _, index = heapq.heappop(frontier)
+            self.num_explored += 1
+
+            # If cell is the goal, then we have a solution
+            if index == goal:
+                return True
+
+            # Mark cell as explored and add unreached neighbors to frontier
+            state[index] |= EXPLORED
+            cost += step
+            for direction, neighbor in self.adjacent(index):
+                if not state[neighbor]:
+                    state[neighbor] = direction
+                    row, col = divmod(neighbor, width)
+                    distance = abs(row - goal_row) + abs(col - goal_col)
+                    heapq.heappush(frontier, (
+                        distance + cost, cost, next(counter), neighbor
+                    ))
+
+        return False
+
+
+    def trace(self, state, index):
+        """Follows stored directions back from `index` to the start."""
+        offsets = (-self.width, self.width, -1, 1)
+        actions = []
+        cells = []
+        while state[index] & DIRECTION != START:
+            direction = (state[index] & DIRECTION) - 1
+            actions.append(ACTIONS[direction])
+            cells.append(self.cell(index))
+            index -= offsets[direction]
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a large maze.")
+    parser.add_argument("maze", help="maze file to solve")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="bfs")
+    args = parser.parse_args()
+
+    m = CompactMaze(args.maze)
+    print(f"Maze: {m.height} x {m.width}")
+    m.solve(args.strategy)
+    print("States Explored:", m.num_explored)
+    print("Solution Length:", len(m.solution[0]))
+
+
+if __name__ == "__main__":
+    main()
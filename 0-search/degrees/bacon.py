@@ -0,0 +1,143 @@
+"""
+Distributions of degrees of separation ("Bacon numbers") from many people.
+
+Runs a full breadth-first search from each source person across a process
+pool and prints, per source, how many people lie at each degree, as one
+JSON line. A final line summarizes the eccentricities found: the largest
+is a lower bound on the diameter of the graph, and twice the smallest
+(among sources in the largest component reached) an upper bound on the
+diameter of that component.
+
+Workers share the graph through the dataset's memory-mapped snapshot,
+which is compiled first if it is missing or stale, so however many
+workers run, the operating system keeps a single copy in memory.
+"""
+
+import argparse
+import json
+import random
+import sys
+
+from concurrent.futures import ProcessPoolExecutor
+
+import snapshot
+
+# Graph of the current worker process, set up by init_worker
+graph = None
+
+
+def init_worker(directory):
+    global graph
+    graph = snapshot.load(directory)[3]
+
+
+def layer_sizes(graph, source):
+    """
+    Returns the number of people at each degree of separation from a
+    person index, starting with the source itself at degree 0.
+    """
+    reached = bytearray(len(graph.person_ids))
+    reached[source] = 1
+    seen_movies = set()
+    layer = [source]
+    sizes = []
+    while layer:
+        sizes.append(len(layer))
+        next_layer = []
+        for person in layer:
+            for _, neighbor in graph.neighbors(person, seen_movies):
+                if not reached[neighbor]:
+                    reached[neighbor] = 1
+                    next_layer.append(neighbor)
+        layer = next_layer
+    return sizes
+
+
+def histogram(source):
+    """Returns the degree histogram of a person index, in a worker."""
+    return source, layer_sizes(graph, source)
+
+
+def hubs(graph, k):
+    """Returns the indices of the k people with the most movies."""
+    return sorted(
+        range(len(graph.person_ids)),
+        key=lambda i: len(graph.person_movies[i]),
+        reverse=True,
+    )[:k]
+
+
+def resolve(data, person):
+    """Returns the index of a person given by id or name, or exits."""
+    names, _, _, graph = data
+    index = graph.person_index(person)
+    if index is not None:
+        return index
+    person_ids = names.get(person.lower(), set())
+    if len(person_ids) != 1:
+        problem = "not found" if not person_ids else "ambiguous"
+        sys.exit(f"Person {problem}: {person}")
+    return graph.person_index(next(iter(person_ids)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Degree-of-separation histograms from many sources."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    sources = parser.add_mutually_exclusive_group()
+    sources.add_argument("--people", nargs="+", metavar="PERSON",
+                         help="source people, by id or name")
+    sources.add_argument("--hubs", type=int, metavar="K",
+                         help="use the K people with the most movies")
+    sources.add_argument("--sample", type=int, metavar="N",
+                         help="use N people chosen at random")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    args = parser.parse_args()
+
+    if not snapshot.is_fresh(args.directory):
+        print("Compiling snapshot...", file=sys.stderr)
+        snapshot.compile_snapshot(args.directory)
+    data = snapshot.load(args.directory)
+    graph = data[3]
+
+    if args.people:
+        sources = [resolve(data, person) for person in args.people]
+    elif args.sample:
+        rng = random.Random(args.seed)
+        sources = rng.sample(range(len(graph.person_ids)), args.sample)
+    else:
+        sources = hubs(graph, args.hubs or 10)
+
+    eccentricities = {}
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             initializer=init_worker,
+                             initargs=(args.directory,)) as executor:
+        for source, sizes in executor.map(histogram, sources):
+            eccentricities[source] = (len(sizes) - 1, sum(sizes))
+            print(json.dumps({
+                "person_id": graph.person_ids[source],
+                "name": data[1][graph.person_ids[source]]["name"],
+                "reached": sum(sizes),
+                "eccentricity": len(sizes) - 1,
+                "histogram": sizes,
+            }), flush=True)
+
+    # Bound the diameter of the largest component reached
+    largest = max(reached for _, reached in eccentricities.values())
+    component = [
+        eccentricity for eccentricity, reached in eccentricities.values()
+        if reached == largest
+    ]
+    print(json.dumps({
+        "sources": len(sources),
+        "largest_component": largest,
+        "diameter_lower_bound": max(component),
+        "diameter_upper_bound": 2 * min(component),
+    }))
+
+
+if __name__ == "__main__":
+    main()
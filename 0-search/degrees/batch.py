@@ -0,0 +1,280 @@
+"""
+Answers many degrees-of-separation queries non-interactively.
+
+Reads "source,target" name pairs (one CSV row each) from a file or
+stdin, groups the queries by source so every source needs a single
+breadth-first search tree, and writes one result per query, in input
+order, as CSV or JSON lines. Trees are kept in a least-recently-used
+cache bounded by memory, and a cached tree rooted at either end of a
+query answers it.
+
+The input may also add rows to the dataset between queries, as ingest.py
+does, with rows starting "+people", "+movies" or "+stars" followed by the
+columns of that CSV file. Later queries see the new rows, and only the
+cached trees reaching a person whose neighbors changed are dropped.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from collections import OrderedDict
+
+import degrees
+
+# Update rows: their first cell, and the table and columns they add to
+UPDATES = {
+    "+people": ("people", ("id", "name", "birth")),
+    "+movies": ("movies", ("id", "title", "year")),
+    "+stars": ("stars", ("person_id", "movie_id")),
+}
+
+
+class TreeCache:
+    """Least-recently-used cache of BFS trees, bounded by their size."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.trees = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, source):
+        return source in self.trees
+
+    def get(self, source):
+        """Returns the cached tree rooted at `source`, or None."""
+        tree = self.trees.get(source)
+        if tree is not None:
+            self.trees.move_to_end(source)
+            self.hits += 1
+        return tree
+
+    def tree(self, source):
+        """Returns the tree rooted at `source`, searching if not cached."""
+        tree = self.get(source)
+        if tree is None:
+            self.misses += 1
+            tree = degrees.bfs_tree(source)
+            self.put(source, tree)
+        return tree
+
+    def put(self, source, tree):
+        """Caches a tree, evicting the least recently used ones over capacity."""
+        self.trees[source] = tree
+        self.size += tree_size(tree)
+        while self.size > self.capacity and len(self.trees) > 1:
+            _, evicted = self.trees.popitem(last=False)
+            self.size -= tree_size(evicted)
+
+
+    def invalidate(self, people):
+        """
+        Drops the cached trees that reach any of these person indices, as
+        returned by degrees.update_data. Other trees cover components the
+        update did not touch, so they stay valid.
+        """
+        for source, tree in list(self.trees.items()):
+            parent_people = tree[0]
+            if any(person < len(parent_people) and parent_people[person] != -1
+                   for person in people):
+                del self.trees[source]
+                self.size -= tree_size(tree)
+
+
+def tree_size(tree):
+    """Returns the bytes held by a tree's arrays."""
+    return sum(len(a) * a.itemsize for a in tree)
+
+
+def reverse_path(path, root):
+    """
+    Turns a path from `root` into the same path walked back to `root`.
+    """
+    people = [root] + [person_id for _, person_id in path]
+    return [
+        (path[i][0], people[i]) for i in reversed(range(len(path)))
+    ]
+
+
+def resolve(name, policy=None, fuzzy=False):
+    """
+    Returns (person_id, None) for a name, or (None, error message).
+
+    People sharing a name, or the fuzzy match for it, are chosen between
+    by `policy`, a non-interactive policy of degrees.disambiguate, or
+    reported as ambiguous if it is None. Batch lookups never prompt.
+    """
+    person_ids = degrees.person_ids_for_name(name, fuzzy)
+    if len(person_ids) == 0:
+        return None, "person not found"
+    elif len(person_ids) == 1:
+        return person_ids[0], None
+    elif policy is None or policy == "ask":
+        return None, "ambiguous name"
+    return degrees.disambiguate(name, person_ids, policy), None
+
+
+def answer(cache, source, target):
+    """Returns the shortest path between two person ids, using the cache."""
+    graph = degrees.graph
+    s = graph.person_index(source)
+    t = graph.person_index(target)
+    if s == t:
+        return []
+
+    # A tree rooted at the target answers the query walked backwards
+    if s not in cache and t in cache:
+        path = degrees.tree_path(cache.get(t), s)
+        return None if path is None else reverse_path(path, target)
+
+    return degrees.tree_path(cache.tree(s), t)
+
+
+def run(items, cache, policy=None, fuzzy=False, directory=None):
+    """
+    Answers queries and applies updates, as read_input yields them, in
+    order: queries are resolved as resolve does, and updates are added
+    to the dataset in `directory`. Returns a result dictionary per query,
+    in the order given.
+    """
+    results = []
+    groups = {}
+    updates = {"people": [], "movies": [], "stars": []}
+    for table, item in items:
+        if table is not None:
+            # Queries before the update are answered on the data before it
+            answer_groups(cache, groups)
+            groups = {}
+            updates[table].append(item)
+            continue
+        if any(updates.values()):
+            apply_updates(directory, cache, updates)
+
+        source_name, target_name = item
+        result = {"source": source_name, "target": target_name}
+        results.append(result)
+        source, error = resolve(source_name, policy, fuzzy)
+        if error is None:
+            target, error = resolve(target_name, policy, fuzzy)
+        if error is not None:
+            result["error"] = error
+            continue
+        result["source_id"] = source
+        result["target_id"] = target
+        groups.setdefault(source, []).append(result)
+
+    answer_groups(cache, groups)
+    if any(updates.values()):
+        apply_updates(directory, cache, updates)
+    return results
+
+
+def answer_groups(cache, groups):
+    """Answers the queries grouped by source person id."""
+    for source, group in groups.items():
+        for result in group:
+            path = answer(cache, source, result["target_id"])
+            result["degrees"] = None if path is None else len(path)
+            result["path"] = path
+
+
+def apply_updates(directory, cache, updates):
+    """
+    Adds the pending rows of each table to the dataset, drops the cached
+    trees they affect and empties the pending lists.
+    """
+    changed = degrees.update_data(directory, updates["people"],
+                                  updates["movies"], updates["stars"])
+    cache.invalidate(changed)
+    for rows in updates.values():
+        rows.clear()
+
+
+def read_input(f):
+    """
+    Yields (None, (source, target)) for query rows and (table, row) for
+    update rows of CSV input, skipping blanks.
+    """
+    for row in csv.reader(f):
+        if not row or not "".join(row).strip():
+            continue
+        if row[0] in UPDATES:
+            table, columns = UPDATES[row[0]]
+            if len(row) != len(columns) + 1:
+                raise ValueError(
+                    f"expected '{row[0]},{','.join(columns)}', got {row!r}"
+                )
+            yield table, dict(zip(columns, row[1:]))
+            continue
+        if len(row) != 2:
+            raise ValueError(f"expected 'source,target', got {row!r}")
+        yield None, (row[0].strip(), row[1].strip())
+
+
+def write_results(results, output_format, f):
+    """Writes results as CSV rows or JSON lines."""
+    if output_format == "json":
+        for result in results:
+            f.write(json.dumps(result) + "\n")
+        return
+
+    writer = csv.writer(f)
+    writer.writerow(["source", "target", "degrees", "path", "error"])
+    for result in results:
+        path = result.get("path")
+        writer.writerow([
+            result["source"],
+            result["target"],
+            "" if result.get("degrees") is None else result["degrees"],
+            " ".join(f"{movie_id}:{person_id}"
+                     for movie_id, person_id in path or []),
+            result.get("error", ""),
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Answer degrees-of-separation queries in bulk."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument(
+        "--input", default="-",
+        help="CSV file of 'source,target' names and update rows "
+             "(default: stdin)"
+    )
+    parser.add_argument("--format", choices=("csv", "json"), default="csv")
+    parser.add_argument(
+        "--cache-mb", type=float, default=256,
+        help="memory cap for cached BFS trees, in megabytes"
+    )
+    parser.add_argument(
+        "--policy", choices=("most-movies", "earliest-birth"),
+        help="how to choose between people sharing a name "
+             "(default: report the query as ambiguous)"
+    )
+    parser.add_argument(
+        "--fuzzy", action="store_true",
+        help="match names nobody has exactly to the most similar name"
+    )
+    args = parser.parse_args()
+
+    degrees.load_data(args.directory)
+    cache = TreeCache(int(args.cache_mb * 2 ** 20))
+
+    if args.input == "-":
+        items = list(read_input(sys.stdin))
+    else:
+        with open(args.input, encoding="utf-8", newline="") as f:
+            items = list(read_input(f))
+
+    results = run(items, cache, args.policy, args.fuzzy, args.directory)
+    write_results(results, args.format, sys.stdout)
+    print(f"{len(results)} queries, {cache.misses} searches, "
+          f"{cache.hits} cache hits", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
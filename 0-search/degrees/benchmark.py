@@ -0,0 +1,219 @@
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+
+from array import array
+
+import degrees
+from util import Node, StackFrontier, QueueFrontier
+
+
+def fill(frontier, n):
+    """
+    Adds `n` nodes to `frontier` and returns the time taken.
+    """
+    start = time.perf_counter()
+    for state in range(n):
+        frontier.add(Node(state=state, parent=None, action=None))
+    return time.perf_counter() - start
+
+
+def benchmark_frontier(frontier_class, n):
+    """
+    Returns the per-operation cost, in nanoseconds, of adding, checking
+    membership of and removing `n` nodes with a `frontier_class` frontier.
+    """
+    frontier = frontier_class()
+    add_time = fill(frontier, n)
+
+    # Half of the membership queries hit, half miss
+    start = time.perf_counter()
+    for state in range(0, 2 * n, 2):
+        frontier.contains_state(state)
+    contains_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    while not frontier.empty():
+        frontier.remove()
+    remove_time = time.perf_counter() - start
+
+    return {
+        "add": add_time / n * 1e9,
+        "contains_state": contains_time / n * 1e9,
+        "remove": remove_time / n * 1e9,
+    }
+
+
+class DictNode():
+    """A search node with a per-instance __dict__, as Node used to be."""
+
+    def __init__(self, state, parent, action):
+        self.state = state
+        self.parent = parent
+        self.action = action
+
+
+def node_chain(node_class, n):
+    """Returns a chain of `n` nodes, each the parent of the next."""
+    node = None
+    for state in range(n):
+        node = node_class(state=state, parent=node, action=state % 1000)
+    return node
+
+
+def parent_dict(n):
+    """Returns a dictionary mapping `n` states to (parent, action)."""
+    parents = {0: None}
+    for state in range(1, n):
+        parents[state] = (state - 1, state % 1000)
+    return parents
+
+
+def parent_arrays(n):
+    """Returns parent and action arrays for `n` integer states."""
+    parents = array("i", [-1]) * n
+    actions = array("i", [-1]) * n
+    for state in range(1, n):
+        parents[state] = state - 1
+        actions[state] = state % 1000
+    return parents, actions
+
+
+def benchmark_memory(build, n):
+    """
+    Returns the bytes per state held by the parent pointers `build`
+    records for `n` states, as traced by tracemalloc.
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        parents = build(n)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del parents
+    return (after - before) / n
+
+
+def breadth_first_search(source, target):
+    """
+    One-sided breadth-first search from the source, as shortest_path
+    used to run. Returns (path, number of people expanded).
+    """
+    frontier = QueueFrontier()
+    frontier.add(Node(state=source, parent=None, action=None))
+    explored = set()
+
+    while not frontier.empty():
+        node = frontier.remove()
+        if node.state == target:
+            path = []
+            while node.parent is not None:
+                path.append((node.action, node.state))
+                node = node.parent
+            path.reverse()
+            return path, len(explored)
+        explored.add(node.state)
+        for movie_id, person_id in degrees.neighbors_for_person(node.state):
+            if person_id not in explored and not frontier.contains_state(person_id):
+                frontier.add(Node(state=person_id, parent=node, action=movie_id))
+
+    return None, len(explored)
+
+
+def benchmark_search(search, pairs):
+    """
+    Runs `search` over (source, target) pairs.
+    Returns the path lengths, people expanded and seconds of each query.
+    """
+    lengths, expanded, seconds = [], [], []
+    for source, target in pairs:
+        start = time.perf_counter()
+        path, explored = search(source, target)
+        seconds.append(time.perf_counter() - start)
+        lengths.append(None if path is None else len(path))
+        expanded.append(explored)
+    return lengths, expanded, seconds
+
+
+def frontier_main(args):
+    print(f"Frontier operations on {args.nodes} nodes (ns per operation):")
+    for frontier_class in (StackFrontier, QueueFrontier):
+        costs = benchmark_frontier(frontier_class, args.nodes)
+        print(f"{frontier_class.__name__}:")
+        for operation, cost in costs.items():
+            print(f"    {operation}: {cost:.0f}")
+
+
+def memory_main(args):
+    print(f"Parent pointers for {args.nodes} states (bytes per state):")
+    for name, build in (
+        ("Node (__dict__)", lambda n: node_chain(DictNode, n)),
+        ("Node (__slots__)", lambda n: node_chain(Node, n)),
+        ("parent dict", parent_dict),
+        ("parent arrays", parent_arrays),
+    ):
+        print(f"    {name}: {benchmark_memory(build, args.nodes):.0f}")
+
+
+def search_main(args):
+    print("Loading data...")
+    degrees.load_data(args.directory)
+
+    # Pick random pairs of people who starred in at least one movie
+    rng = random.Random(args.seed)
+    actors = [
+        person_id for person_id in degrees.people
+        if degrees.people[person_id]["movies"]
+    ]
+    pairs = [tuple(rng.sample(actors, 2)) for _ in range(args.pairs)]
+
+    print(f"{len(pairs)} random pairs of actors:")
+    results = {}
+    for name, search in (
+        ("one-sided", breadth_first_search),
+        ("bidirectional", degrees.bidirectional_search),
+    ):
+        lengths, expanded, seconds = benchmark_search(search, pairs)
+        results[name] = lengths
+        print(f"{name}:")
+        print(f"    mean people expanded: {statistics.mean(expanded):.0f}")
+        print(f"    median latency: {statistics.median(seconds) * 1e3:.2f}ms")
+        print(f"    max latency: {max(seconds) * 1e3:.2f}ms")
+
+    if results["one-sided"] != results["bidirectional"]:
+        print("Path lengths differ between searches!")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    frontier = commands.add_parser(
+        "frontier", help="time frontier operations"
+    )
+    frontier.add_argument("nodes", type=int, nargs="?", default=10 ** 6)
+    frontier.set_defaults(run=frontier_main)
+
+    memory = commands.add_parser(
+        "memory", help="measure memory of ways of tracking parents"
+    )
+    memory.add_argument("nodes", type=int, nargs="?", default=10 ** 6)
+    memory.set_defaults(run=memory_main)
+
+    search = commands.add_parser(
+        "search", help="compare one-sided and bidirectional BFS"
+    )
+    search.add_argument("directory", nargs="?", default="large")
+    search.add_argument("--pairs", type=int, default=100)
+    search.add_argument("--seed", type=int, default=0)
+    search.set_defaults(run=search_main)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
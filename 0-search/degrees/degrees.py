@@ -1,7 +1,12 @@
 import csv
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from array import array
+from collections import deque
+
+import snapshot
+from graph import Graph
+from nameindex import NameIndex
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +17,25 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# Integer-indexed graph of people and movies, searched by shortest_path
+graph = None
+
+# Prefix and fuzzy index over names, built when they are loaded
+names_indexed = None
+
 
 def load_data(directory):
     """
     Load data from CSV files into memory.
+
+    If the directory holds a snapshot newer than its CSV files (see
+    snapshot.py), it is memory-mapped instead of parsing the CSVs.
     """
+    global names, people, movies, graph
+    if snapshot.is_fresh(directory):
+        names, people, movies, graph = snapshot.load(directory)
+        return
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -51,6 +70,101 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    graph = Graph.from_data(people, movies)
+
+    # Build the fuzzy index now, not on the first lookup
+    name_index()
+
+
+def update_data(directory, people_rows=(), movie_rows=(), star_rows=()):
+    """
+    Adds rows of people.csv, movies.csv and stars.csv to the data loaded
+    from `directory`, without reloading it, and appends them to its CSV
+    files (and to its snapshot's delta, if the snapshot is up to date).
+
+    Rows for people or movies already loaded are ignored, as are stars
+    already known or naming unknown people or movies.
+    Returns the indices of the people whose neighbors changed.
+    """
+    global names_indexed
+    fresh = snapshot.is_fresh(directory)
+    added = []
+    changed = set()
+    for table, rows in (
+        ("people", people_rows), ("movies", movie_rows), ("stars", star_rows)
+    ):
+        for row in rows:
+            people_changed = add_row(table, row)
+            if people_changed is not None:
+                added.append((table, row))
+                changed |= people_changed
+
+    for table, fields in (
+        ("people", ("id", "name", "birth")),
+        ("movies", ("id", "title", "year")),
+        ("stars", ("person_id", "movie_id")),
+    ):
+        rows = [row for row_table, row in added if row_table == table]
+        if rows:
+            with open(f"{directory}/{table}.csv", "a", encoding="utf-8",
+                      newline="") as f:
+                writer = csv.DictWriter(f, fields, extrasaction="ignore",
+                                        lineterminator="\n")
+                writer.writerows(rows)
+    if fresh and added:
+        snapshot.append_delta(directory, added)
+
+    # New names need a new name index
+    if any(table == "people" for table, _ in added):
+        names_indexed = None
+        name_index()
+    return changed
+
+
+def add_row(table, row):
+    """
+    Adds one row to the loaded data, as update_data does.
+    Returns the indices of the people whose neighbors changed, or None if
+    the row was ignored.
+    """
+    if isinstance(people, snapshot.People):
+        return people.snapshot.apply(table, row)
+
+    if table == "people":
+        if row["id"] in people:
+            return None
+        people[row["id"]] = {
+            "name": row["name"],
+            "birth": row["birth"],
+            "movies": set(),
+        }
+        names.setdefault(row["name"].lower(), set()).add(row["id"])
+        graph.add_person(row["id"])
+        return set()
+    elif table == "movies":
+        if row["id"] in movies:
+            return None
+        movies[row["id"]] = {
+            "title": row["title"],
+            "year": row["year"],
+            "stars": set(),
+        }
+        graph.add_movie(row["id"])
+        return set()
+    elif table == "stars":
+        person_id, movie_id = row["person_id"], row["movie_id"]
+        if (person_id not in people or movie_id not in movies
+                or movie_id in people[person_id]["movies"]):
+            return None
+        people[person_id]["movies"].add(movie_id)
+        movies[movie_id]["stars"].add(person_id)
+        person = graph.person_index(person_id)
+        movie = graph.movie_index(movie_id)
+        changed = set(graph.movie_stars[movie]) | {person}
+        graph.add_star(person, movie)
+        return changed
+    raise ValueError(f"unknown table {table!r}")
+
 
 def main():
     if len(sys.argv) > 2:
@@ -91,71 +205,211 @@ def shortest_path(source, target):
 
     If no possible path, returns None.
     """
-    # Initialize Queue Frontier for BFS
-    source_node = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
-    frontier.add(source_node)
+    return bidirectional_search(source, target)[0]
 
-    explored_states = set()
 
-    while True:
-        if frontier.empty():
-            return None
+def bidirectional_search(source, target):
+    """
+    Breadth-first searches from both the source and the target, always
+    growing the smaller frontier by a whole layer, until the two meet.
+
+    Returns the path as shortest_path does, and the number of people
+    whose neighbors were expanded.
+    """
+    if source == target:
+        return [], 0
+    source = graph.person_index(source)
+    target = graph.person_index(target)
+    if source is None or target is None:
+        return None, 0
+
+    # Map each reached person index to the (movie, person) indices they
+    # were reached through, and track the movies each side has expanded
+    forward = {source: None}
+    backward = {target: None}
+    forward_movies = set()
+    backward_movies = set()
+    forward_layer = [source]
+    backward_layer = [target]
+    explored = 0
+
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meeting, expanded = expand_layer(
+                forward_layer, forward, forward_movies, backward
+            )
+        else:
+            backward_layer, meeting, expanded = expand_layer(
+                backward_layer, backward, backward_movies, forward
+            )
+        explored += expanded
+
+        if meeting is not None:
 
-        current_node = frontier.remove()
+            # Walk back from the meeting person to the source
+            path = []
+            person = meeting
+            while forward[person] is not None:
+                movie, previous = forward[person]
+                path.append((movie, person))
+                person = previous
+            path.reverse()
 
-        # If node is the target, retroactively build shortest_path
-        if current_node.state == target:
-            shortest_path = []
-            while current_node.parent is not None:
-                shortest_path.append((current_node.action, current_node.state))
-                current_node = current_node.parent
-            shortest_path.reverse()
-            return shortest_path
+            # Then walk on from the meeting person to the target
+            person = meeting
+            while backward[person] is not None:
+                movie, person = backward[person]
+                path.append((movie, person))
 
-        # Add current node state to explored
-        explored_states.add(current_node.state)
+            return [
+                (graph.movie_ids[movie], graph.person_ids[person])
+                for movie, person in path
+            ], explored
 
-        # Add unexplored neighbours to frontier
-        neighbours = neighbors_for_person(current_node.state)
-        for movie_id, person_id in neighbours:
-            if person_id not in explored_states and not frontier.contains_state(
-                state=person_id
-            ):
-                child = Node(
-                    state=person_id,
-                    parent=current_node,
-                    action=movie_id,
-                )
-                frontier.add(child)
+    return None, explored
 
 
-def person_id_for_name(name):
+def expand_layer(layer, parents, seen_movies, others):
+    """
+    Expands every person in `layer`, recording newly reached people in
+    `parents` and expanded movies in `seen_movies`.
+
+    Returns the next layer, the first new person already reached by the
+    other search in `others` (or None), and the number of people expanded.
+    Every meeting found within one layer gives a path of the same length,
+    so the first is a shortest one.
+    """
+    next_layer = []
+    for expanded, person in enumerate(layer, 1):
+        for movie, neighbor in graph.neighbors(person, seen_movies):
+            if neighbor not in parents:
+                parents[neighbor] = (movie, person)
+                if neighbor in others:
+                    return next_layer, neighbor, expanded
+                next_layer.append(neighbor)
+    return next_layer, None, len(layer)
+
+
+def bfs_tree(source):
+    """
+    Breadth-first searches the whole graph from a person index.
+
+    Returns (parent_people, parent_movies) arrays giving, for every person
+    index, the person and movie indices they were first reached through.
+    The source is its own parent, and unreached people have parent -1.
+    """
+    parent_people = array("i", [-1]) * len(graph.person_ids)
+    parent_movies = array("i", [-1]) * len(graph.person_ids)
+    parent_people[source] = source
+    seen_movies = set()
+    frontier = deque([source])
+    while frontier:
+        person = frontier.popleft()
+        for movie, neighbor in graph.neighbors(person, seen_movies):
+            if parent_people[neighbor] == -1:
+                parent_people[neighbor] = person
+                parent_movies[neighbor] = movie
+                frontier.append(neighbor)
+    return parent_people, parent_movies
+
+
+def tree_path(tree, target):
+    """
+    Returns the path from the root of a bfs_tree to a person index, as
+    shortest_path does, or None if the tree does not reach them.
+    """
+    parent_people, parent_movies = tree
+
+    # People added after the tree was built are not in it
+    if target >= len(parent_people) or parent_people[target] == -1:
+        return None
+    path = []
+    person = target
+    while parent_people[person] != person:
+        path.append((graph.movie_ids[parent_movies[person]],
+                     graph.person_ids[person]))
+        person = parent_people[person]
+    path.reverse()
+    return path
+
+
+def person_id_for_name(name, policy="ask", fuzzy=False):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    `policy` says how to choose between people sharing a name: "ask"
+    prompts on stdin, while "most-movies" and "earliest-birth" choose
+    without blocking. If `fuzzy` is True and nobody has exactly this
+    name, the most similar name in the index is used instead.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    person_ids = person_ids_for_name(name, fuzzy)
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
-        print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
-            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
-        try:
-            person_id = input("Intended Person ID: ")
-            if person_id in person_ids:
-                return person_id
-        except ValueError:
-            pass
-        return None
+        return disambiguate(name, person_ids, policy)
     else:
         return person_ids[0]
 
 
+def person_ids_for_name(name, fuzzy=False):
+    """
+    Returns the sorted IMDB ids of the people with a name, or with the
+    most similar name in the index if `fuzzy` is True and nobody has
+    exactly this one.
+    """
+    person_ids = sorted(name_index().exact(name))
+    if len(person_ids) == 0 and fuzzy:
+        matches = name_index().fuzzy(name, limit=1)
+        if matches:
+            person_ids = sorted(name_index().exact(matches[0][1]))
+    return person_ids
+
+
+def disambiguate(name, person_ids, policy):
+    """
+    Chooses one of several person_ids sharing a name, following `policy`.
+    """
+    if policy == "most-movies":
+        return max(person_ids, key=lambda person_id: len(
+            people[person_id]["movies"]
+        ))
+    elif policy == "earliest-birth":
+        # People with no known birth year come last
+        return min(person_ids, key=lambda person_id: (
+            not people[person_id]["birth"], people[person_id]["birth"]
+        ))
+    elif policy != "ask":
+        raise ValueError(f"unknown disambiguation policy {policy!r}")
+
+    print(f"Which '{name}'?")
+    for person_id in person_ids:
+        person = people[person_id]
+        name = person["name"]
+        birth = person["birth"]
+        print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+    try:
+        person_id = input("Intended Person ID: ")
+        if person_id in person_ids:
+            return person_id
+    except ValueError:
+        pass
+    return None
+
+
+def name_index():
+    """Returns the index of the loaded names, building it on first use."""
+    global names_indexed
+    if names_indexed is None or names_indexed.names is not names:
+        # A snapshot's names come sorted, with a gram index compiled in
+        if isinstance(names, snapshot.Names):
+            names_indexed = NameIndex(names, names.sorted,
+                                      names.gram_sources())
+        else:
+            names_indexed = NameIndex(names)
+    return names_indexed
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
@@ -0,0 +1,177 @@
+"""
+Integer-indexed bipartite graph of people and the movies they starred in.
+
+People and movies are numbered 0..n-1 and adjacency is stored in CSR
+form: the neighbors of row i are indices[indptr[i]:indptr[i + 1]]. The
+same arrays back both graphs built from the CSV dictionaries and graphs
+read straight out of a memory-mapped snapshot.
+
+People, movies and stars added after the arrays were packed are kept in
+small overlays beside them, so a graph can grow without being rebuilt.
+"""
+
+from array import array
+
+
+def csr(rows, edges):
+    """Packs (row, column) pairs into (indptr, indices) arrays."""
+    indptr = array("i", [0]) * (rows + 1)
+    for row, _ in edges:
+        indptr[row + 1] += 1
+    for row in range(rows):
+        indptr[row + 1] += indptr[row]
+    indices = array("i", [0]) * len(edges)
+    position = indptr[:-1]
+    for row, column in edges:
+        indices[position[row]] = column
+        position[row] += 1
+    return indptr, indices
+
+
+class Extended:
+    """Read-only sequence followed by items appended to it since."""
+
+    def __init__(self, base):
+        self.base = base
+        self.added = []
+
+    def __len__(self):
+        return len(self.base) + len(self.added)
+
+    def __getitem__(self, i):
+        if i < len(self.base):
+            return self.base[i]
+        return self.added[i - len(self.base)]
+
+    def __iter__(self):
+        yield from self.base
+        yield from self.added
+
+    def append(self, item):
+        self.added.append(item)
+
+
+class Adjacency:
+    """CSR adjacency lists, indexed by row, plus entries added since."""
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+
+        # Rows added after the arrays, and columns added to any row
+        self.added_rows = 0
+        self.extra = {}
+
+    def __len__(self):
+        return len(self.indptr) - 1 + self.added_rows
+
+    def __getitem__(self, row):
+        extra = self.extra.get(row)
+        if row >= len(self.indptr) - 1:
+            return extra or []
+        columns = self.indices[self.indptr[row]:self.indptr[row + 1]]
+        return columns if extra is None else [*columns, *extra]
+
+    def add_row(self):
+        """Adds an empty row and returns its index."""
+        self.added_rows += 1
+        return len(self) - 1
+
+    def add(self, row, column):
+        """Adds a column to a row."""
+        self.extra.setdefault(row, []).append(column)
+
+
+class Graph:
+
+    def __init__(self, person_ids, movie_ids, person_movies, movie_stars,
+                 person_index, movie_index):
+        """
+        Each graph has
+            - `person_ids`, `movie_ids`: the string id of each index, as
+              lists or Extended sequences
+            - `person_movies`: the movie indices of each person
+            - `movie_stars`: the person indices of each movie
+            - `person_index`, `movie_index`: functions mapping the ids the
+              graph was built with to their indices, or None
+        """
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        self.person_movies = person_movies
+        self.movie_stars = movie_stars
+        self.base_person_index = person_index
+        self.base_movie_index = movie_index
+
+        # Indices of the people and movies added since the graph was built
+        self.added_people = {}
+        self.added_movies = {}
+
+    @classmethod
+    def from_data(cls, people, movies):
+        """Builds a graph from the `people` and `movies` dictionaries."""
+        person_ids = list(people)
+        movie_ids = list(movies)
+        person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+        movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        stars = [
+            (i, movie_index[movie_id])
+            for i, person_id in enumerate(person_ids)
+            for movie_id in people[person_id]["movies"]
+        ]
+        person_movies = Adjacency(*csr(len(person_ids), stars))
+        movie_stars = Adjacency(*csr(
+            len(movie_ids), [(movie, person) for person, movie in stars]
+        ))
+        return cls(person_ids, movie_ids, person_movies, movie_stars,
+                   person_index.get, movie_index.get)
+
+    def person_index(self, person_id):
+        """Returns the index of a person id, or None."""
+        index = self.base_person_index(person_id)
+        return self.added_people.get(person_id) if index is None else index
+
+    def movie_index(self, movie_id):
+        """Returns the index of a movie id, or None."""
+        index = self.base_movie_index(movie_id)
+        return self.added_movies.get(movie_id) if index is None else index
+
+    def add_person(self, person_id):
+        """Adds a person with no movies, unless known. Returns its index."""
+        index = self.person_index(person_id)
+        if index is None:
+            self.person_ids.append(person_id)
+            index = self.added_people[person_id] = self.person_movies.add_row()
+        return index
+
+    def add_movie(self, movie_id):
+        """Adds a movie with no stars, unless known. Returns its index."""
+        index = self.movie_index(movie_id)
+        if index is None:
+            self.movie_ids.append(movie_id)
+            index = self.added_movies[movie_id] = self.movie_stars.add_row()
+        return index
+
+    def add_star(self, person, movie):
+        """
+        Records that a person index starred in a movie index.
+        Returns False if that was already known.
+        """
+        if movie in self.person_movies[person]:
+            return False
+        self.person_movies.add(person, movie)
+        self.movie_stars.add(movie, person)
+        return True
+
+    def neighbors(self, person, seen_movies):
+        """
+        Lazily yields (movie, person) index pairs for people who starred
+        with `person`, skipping movies already in `seen_movies` and adding
+        the rest, so each movie is only expanded once per search.
+        """
+        movie_stars = self.movie_stars
+        for movie in self.person_movies[person]:
+            if movie not in seen_movies:
+                seen_movies.add(movie)
+                for star in movie_stars[movie]:
+                    yield movie, star
@@ -0,0 +1,49 @@
+"""
+Adds new people, movies and stars to a degrees dataset in place.
+
+Each input is a CSV file with the same columns as the dataset's own
+people.csv, movies.csv or stars.csv. New rows are appended to the
+dataset, and to the delta of its snapshot if that is up to date, so the
+next load sees them without compiling the snapshot again.
+"""
+
+import argparse
+import csv
+import sys
+
+import degrees
+
+
+def read_rows(filename):
+    """Returns the rows of a CSV file as dictionaries, or none."""
+    if filename is None:
+        return []
+    with open(filename, encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Add new rows to a degrees dataset."
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--people", help="CSV file of new people")
+    parser.add_argument("--movies", help="CSV file of new movies")
+    parser.add_argument("--stars", help="CSV file of new stars")
+    args = parser.parse_args()
+
+    people_rows = read_rows(args.people)
+    movie_rows = read_rows(args.movies)
+    star_rows = read_rows(args.stars)
+
+    degrees.load_data(args.directory)
+    before = len(degrees.people), len(degrees.movies)
+    changed = degrees.update_data(args.directory, people_rows, movie_rows,
+                                  star_rows)
+    print(f"{len(degrees.people) - before[0]} people and "
+          f"{len(degrees.movies) - before[1]} movies added, "
+          f"{len(changed)} people with new neighbors", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
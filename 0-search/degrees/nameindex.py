@@ -0,0 +1,171 @@
+"""
+Index of people's names for exact, prefix and fuzzy lookup.
+
+Names are kept lowercase and sorted, so prefix queries are a binary
+search. Fuzzy queries use an inverted index from grams (the character
+4-grams and the whole words of a name) to names, built when the names
+are loaded or compiled into a snapshot (see snapshot.py). Candidates are
+counted over the query's rarest grams only, up to a small fixed number
+of postings, and the best-counted few are ranked by the Jaccard
+similarity of their trigram sets. 4-grams and words are much rarer than
+trigrams, so the few postings counted still find the intended name, and
+the work per lookup stays bounded when common grams match millions of
+names.
+"""
+
+import bisect
+import heapq
+import zlib
+
+from array import array
+from collections import Counter
+
+# Postings counted per fuzzy lookup (the rarest gram is always counted)
+MAX_POSTINGS = 2000
+
+# Candidates sharing the most grams with a query that are then scored
+MAX_CANDIDATES = 20
+
+
+def normalize(name):
+    """Returns a name lowercased with runs of whitespace collapsed."""
+    return " ".join(name.lower().split())
+
+
+def trigrams(name):
+    """Returns the set of character trigrams of a padded name."""
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def grams(name):
+    """
+    Returns the set of grams a name is indexed under: the character
+    4-grams of the padded name, and its words marked with a leading NUL.
+    """
+    padded = f"   {name} "
+    return ({padded[i:i + 4] for i in range(len(padded) - 3)}
+            | {"\0" + word for word in name.split()})
+
+
+def gram_code(gram):
+    """Returns a 64-bit code for a gram, as stored in a snapshot."""
+    data = gram.encode("utf-8")
+    return zlib.crc32(data) << 32 | zlib.adler32(data)
+
+
+def gram_postings(keys):
+    """
+    Returns a dictionary from each gram of `keys` to an array of the
+    positions of the keys that have it, in order.
+    """
+    postings = {}
+    for position, key in enumerate(keys):
+        for gram in grams(key):
+            positions = postings.get(gram)
+            if positions is None:
+                positions = postings[gram] = array("i")
+            positions.append(position)
+    return postings
+
+
+class Grams:
+    """In-memory gram index over a list of lowercase names."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.postings_of = gram_postings(keys)
+
+    def postings(self, gram):
+        """Returns the positions of the names with a gram."""
+        return self.postings_of.get(gram, ())
+
+    def key(self, position):
+        """Returns the name at a position."""
+        return self.keys[position]
+
+
+class NameIndex:
+
+    def __init__(self, names, ordered=None, sources=None):
+        """
+        Builds an index over `names`, a mapping from lowercase names to
+        sets of person ids (the `names` dictionary of degrees). `ordered`,
+        if given, returns the names already sorted, saving a sort.
+
+        `sources` are prebuilt gram indexes that together cover every
+        name once, each with `postings` and `key` methods as Grams has. Without them, one is built over the sorted names now;
+        otherwise the sorted names wait for the first prefix query.
+        """
+        self.names = names
+        self.ordered = ordered
+        self.sorted_keys = None
+        if sources is None:
+            sources = [Grams(self.keys)]
+        self.sources = sources
+
+    @property
+    def keys(self):
+        """The sorted names, built on first use."""
+        if self.sorted_keys is None:
+            if self.ordered is not None:
+                self.sorted_keys = self.ordered()
+            else:
+                self.sorted_keys = sorted(self.names)
+        return self.sorted_keys
+
+    def exact(self, name):
+        """Returns the set of person ids with exactly this name."""
+        return set(self.names.get(name.lower(), set()))
+
+    def prefix(self, prefix, limit=10):
+        """Returns up to `limit` names starting with `prefix`, in order."""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.keys, prefix)
+        matches = []
+        for key in self.keys[start:start + limit]:
+            if not key.startswith(prefix):
+                break
+            matches.append(key)
+        return matches
+
+    def fuzzy(self, name, limit=5, threshold=0.4):
+        """
+        Returns up to `limit` (similarity, name) pairs for the names most
+        similar to `name`, best first, ignoring those below `threshold`.
+        """
+        name = normalize(name)
+        scored = []
+        for source in self.sources:
+            scored.extend(candidates(source, name, threshold))
+        return heapq.nlargest(limit, scored, key=lambda pair: pair[0])
+
+
+def candidates(source, name, threshold):
+    """
+    Returns (similarity, name) pairs for the names of a gram source that
+    share the most of a normalized name's rarest grams, ignoring those
+    below `threshold`.
+    """
+    postings = sorted(
+        (positions
+         for positions in map(source.postings, grams(name)) if positions),
+        key=len,
+    )
+    counts = Counter()
+    counted = 0
+    for positions in postings:
+        if counted and counted + len(positions) > MAX_POSTINGS:
+            break
+        counts.update(positions)
+        counted += len(positions)
+
+    query = trigrams(name)
+    scored = []
+    for position, _ in counts.most_common(MAX_CANDIDATES):
+        key = source.key(position)
+        keygrams = trigrams(key)
+        score = len(query & keygrams) / len(query | keygrams)
+        if score >= threshold:
+            scored.append((score, key))
+    return scored
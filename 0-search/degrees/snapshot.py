@@ -0,0 +1,490 @@
+"""
+Compact binary snapshot of a degrees dataset.
+
+`python snapshot.py [directory]` compiles people.csv, movies.csv and
+stars.csv into a single `graph.snapshot` file holding:
+    - people and movies as integer indices, with their string fields
+      (ids, names, births, titles, years) packed into string tables
+    - CSR adjacency arrays for person -> movies and movie -> stars
+    - sorted orders for looking people and movies up by id, and people
+      up by lowercase name
+    - a gram index over the distinct lowercase names, for fuzzy lookups
+      (see nameindex.py), keyed by sorted 64-bit gram codes
+
+Loading memory-maps the file, so it takes milliseconds however large the
+dataset is; records are only decoded when they are looked at.
+
+Rows added to a dataset later (see degrees.update_data) are appended to
+a `graph.delta` file of JSON lines beside the snapshot and replayed on
+top of it when loading, until the snapshot is next compiled.
+"""
+
+import bisect
+import csv
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+
+from array import array
+from collections.abc import Mapping
+
+from graph import Adjacency, Extended, Graph, csr
+from nameindex import Grams, gram_code, gram_postings
+
+SNAPSHOT = "graph.snapshot"
+DELTA = "graph.delta"
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+MAGIC = b"DEGREES2"
+
+# Sections of a snapshot, in file order, with their array typecodes
+SECTIONS = (
+    ("person_ids", "q"), ("person_ids_data", "B"),
+    ("person_names", "q"), ("person_names_data", "B"),
+    ("person_births", "q"), ("person_births_data", "B"),
+    ("movie_ids", "q"), ("movie_ids_data", "B"),
+    ("movie_titles", "q"), ("movie_titles_data", "B"),
+    ("movie_years", "q"), ("movie_years_data", "B"),
+    ("person_movies_indptr", "i"), ("person_movies", "i"),
+    ("movie_stars_indptr", "i"), ("movie_stars", "i"),
+    ("person_id_order", "i"), ("movie_id_order", "i"),
+    ("name_order", "i"), ("name_starts", "i"),
+    ("gram_codes", "Q"),
+    ("gram_postings_indptr", "q"), ("gram_postings", "i"),
+)
+
+# File header: magic and number of sections, then offset and size of each
+HEADER = struct.Struct("<8sI")
+ENTRY = struct.Struct("<QQ")
+
+
+def path_for(directory):
+    """Returns the path of the snapshot of a dataset directory."""
+    return os.path.join(directory, SNAPSHOT)
+
+
+def delta_path_for(directory):
+    """Returns the path of the delta of a dataset directory's snapshot."""
+    return os.path.join(directory, DELTA)
+
+
+def is_fresh(directory):
+    """
+    Returns True if the snapshot exists in the current format and, with
+    its delta, is newer than every CSV. The delta is always written after
+    the CSV rows it holds.
+    """
+    try:
+        built = os.path.getmtime(path_for(directory))
+        with open(path_for(directory), "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                return False
+    except OSError:
+        return False
+    try:
+        built = max(built, os.path.getmtime(delta_path_for(directory)))
+    except OSError:
+        pass
+    return all(
+        os.path.getmtime(os.path.join(directory, source)) <= built
+        for source in SOURCES
+    )
+
+
+def string_table(strings):
+    """Packs strings into (offsets, data) arrays."""
+    offsets = array("q", [0])
+    data = bytearray()
+    for string in strings:
+        data += string.encode("utf-8")
+        offsets.append(len(data))
+    return offsets, array("B", data)
+
+
+def compile_snapshot(directory):
+    """
+    Reads the CSV files of a dataset and writes its snapshot.
+    """
+    person_ids, person_names, person_births = [], [], []
+    with open(os.path.join(directory, "people.csv"), encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person_ids.append(row["id"])
+            person_names.append(row["name"])
+            person_births.append(row["birth"])
+
+    movie_ids, movie_titles, movie_years = [], [], []
+    with open(os.path.join(directory, "movies.csv"), encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            movie_ids.append(row["id"])
+            movie_titles.append(row["title"])
+            movie_years.append(row["year"])
+
+    # Later rows win for repeated ids, as they do when loading the CSVs
+    people = {person_id: i for i, person_id in enumerate(person_ids)}
+    movies = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+    stars = set()
+    with open(os.path.join(directory, "stars.csv"), encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            try:
+                stars.add((people[row["person_id"]], movies[row["movie_id"]]))
+            except KeyError:
+                pass
+    stars = sorted(stars)
+
+    sections = {}
+    for name, strings in (
+        ("person_ids", person_ids), ("person_names", person_names),
+        ("person_births", person_births), ("movie_ids", movie_ids),
+        ("movie_titles", movie_titles), ("movie_years", movie_years),
+    ):
+        sections[name], sections[f"{name}_data"] = string_table(strings)
+    sections["person_movies_indptr"], sections["person_movies"] = csr(
+        len(person_ids), stars
+    )
+    sections["movie_stars_indptr"], sections["movie_stars"] = csr(
+        len(movie_ids), sorted((m, p) for p, m in stars)
+    )
+    sections["person_id_order"] = array("i", sorted(
+        people.values(), key=person_ids.__getitem__
+    ))
+    sections["movie_id_order"] = array("i", sorted(
+        movies.values(), key=movie_ids.__getitem__
+    ))
+    sections["name_order"] = array("i", sorted(
+        people.values(), key=lambda i: person_names[i].lower()
+    ))
+
+    # Where each distinct name starts in name_order, and which distinct
+    # names have each gram
+    keys = []
+    sections["name_starts"] = array("i")
+    for position, i in enumerate(sections["name_order"]):
+        key = person_names[i].lower()
+        if not keys or key != keys[-1]:
+            keys.append(key)
+            sections["name_starts"].append(position)
+    postings = gram_postings(keys)
+    codes = sorted((gram_code(gram), gram) for gram in postings)
+    sections["gram_codes"] = array("Q", [code for code, _ in codes])
+    indptr = array("q", [0])
+    flat = array("i")
+    for _, gram in codes:
+        flat.extend(postings[gram])
+        indptr.append(len(flat))
+    sections["gram_postings_indptr"] = indptr
+    sections["gram_postings"] = flat
+
+    write(path_for(directory), sections)
+
+    # The new snapshot already holds every row of the old delta
+    try:
+        os.remove(delta_path_for(directory))
+    except FileNotFoundError:
+        pass
+
+
+def append_delta(directory, rows):
+    """Appends (table, row) pairs to the delta of a dataset's snapshot."""
+    with open(delta_path_for(directory), "a", encoding="utf-8") as f:
+        for table, row in rows:
+            f.write(json.dumps([table, row]) + "\n")
+
+
+def write(path, sections):
+    """Writes section arrays to `path`, each aligned to 8 bytes."""
+    offset = HEADER.size + ENTRY.size * len(SECTIONS)
+    entries = []
+    for name, _ in SECTIONS:
+        offset += -offset % 8
+        size = len(sections[name]) * sections[name].itemsize
+        entries.append((offset, size))
+        offset += size
+
+    # Write to a temporary file first so readers never see a partial one
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(SECTIONS)))
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+        for (name, _), (offset, _) in zip(SECTIONS, entries):
+            f.write(bytes(offset - f.tell()))
+            sections[name].tofile(f)
+    os.replace(f"{path}.tmp", path)
+
+
+class StringTable:
+    """Read-only sequence of the strings in a packed string table."""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError("string index out of range")
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+
+class Snapshot:
+    """A memory-mapped snapshot of a degrees dataset."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mmap)
+
+        magic, count = HEADER.unpack_from(view)
+        if magic != MAGIC or count != len(SECTIONS):
+            raise ValueError(f"{path} is not a degrees snapshot")
+        for i, (name, typecode) in enumerate(SECTIONS):
+            offset, size = ENTRY.unpack_from(
+                view, HEADER.size + i * ENTRY.size
+            )
+            setattr(self, name, view[offset:offset + size].cast(typecode))
+
+        for name in ("person_ids", "person_names", "person_births",
+                     "movie_ids", "movie_titles", "movie_years"):
+            table = StringTable(getattr(self, name),
+                                getattr(self, f"{name}_data"))
+            setattr(self, name, Extended(table))
+
+        self.graph = Graph(
+            self.person_ids, self.movie_ids,
+            Adjacency(self.person_movies_indptr, self.person_movies),
+            Adjacency(self.movie_stars_indptr, self.movie_stars),
+            self.person_index, self.movie_index,
+        )
+
+        # Maps the lowercase names of people added since to their indices
+        self.added_names = {}
+
+    def person_index(self, person_id):
+        """Returns the index of a person id compiled in, or None."""
+        return search(self.person_id_order, self.person_ids.__getitem__,
+                      person_id)
+
+    def movie_index(self, movie_id):
+        """Returns the index of a movie id compiled in, or None."""
+        return search(self.movie_id_order, self.movie_ids.__getitem__,
+                      movie_id)
+
+    def postings(self, gram):
+        """
+        Returns the positions (in name_starts) of the distinct compiled
+        names with a gram.
+        """
+        code = gram_code(gram)
+        index = bisect.bisect_left(self.gram_codes, code)
+        if index == len(self.gram_codes) or self.gram_codes[index] != code:
+            return ()
+        indptr = self.gram_postings_indptr
+        return self.gram_postings[indptr[index]:indptr[index + 1]]
+
+    def key(self, position):
+        """Returns the distinct compiled name at a position."""
+        return self.person_names[
+            self.name_order[self.name_starts[position]]
+        ].lower()
+
+    def added_only(self):
+        """Returns the sorted names that only people added since have."""
+        return sorted(
+            name for name, indices in self.added_names.items()
+            if len(self.people_named(name)) == len(indices)
+        )
+
+    def people_named(self, name):
+        """Returns the indices of the people with a lowercase name."""
+        key = lambda i: self.person_names[i].lower()
+        lo = lower_bound(self.name_order, key, name)
+        hi = lo
+        while hi < len(self.name_order) and key(self.name_order[hi]) == name:
+            hi += 1
+        return [*self.name_order[lo:hi], *self.added_names.get(name, ())]
+
+    def apply(self, table, row):
+        """
+        Adds a row of people.csv, movies.csv or stars.csv on top of the
+        snapshot, as degrees.update_data does for loaded CSVs.
+
+        Returns the indices of the people whose neighbors changed, or None
+        if the row was ignored: rows for known ids and known or dangling
+        stars add nothing.
+        """
+        graph = self.graph
+        if table == "people":
+            if graph.person_index(row["id"]) is not None:
+                return None
+            index = graph.add_person(row["id"])
+            self.person_names.append(row["name"])
+            self.person_births.append(row["birth"])
+            self.added_names.setdefault(row["name"].lower(), []).append(index)
+            return set()
+        elif table == "movies":
+            if graph.movie_index(row["id"]) is not None:
+                return None
+            graph.add_movie(row["id"])
+            self.movie_titles.append(row["title"])
+            self.movie_years.append(row["year"])
+            return set()
+        elif table == "stars":
+            person = graph.person_index(row["person_id"])
+            movie = graph.movie_index(row["movie_id"])
+            if person is None or movie is None:
+                return None
+            costars = set(graph.movie_stars[movie])
+            if not graph.add_star(person, movie):
+                return None
+            return costars | {person}
+        raise ValueError(f"unknown table {table!r}")
+
+    def replay(self, path):
+        """Applies the rows of a delta file, if there is one."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    self.apply(*json.loads(line))
+        except FileNotFoundError:
+            pass
+
+
+def lower_bound(order, key, value):
+    """Returns the first position in `order` whose key is not below value."""
+    lo, hi = 0, len(order)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if key(order[mid]) < value:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def search(order, key, value):
+    """Returns the item of `order` whose key equals value, or None."""
+    position = lower_bound(order, key, value)
+    if position < len(order) and key(order[position]) == value:
+        return order[position]
+    return None
+
+
+class People(Mapping):
+    """The `people` dictionary of degrees, read from a snapshot."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, person_id):
+        snapshot = self.snapshot
+        i = snapshot.graph.person_index(person_id)
+        if i is None:
+            raise KeyError(person_id)
+        return {
+            "name": snapshot.person_names[i],
+            "birth": snapshot.person_births[i],
+            "movies": {
+                snapshot.movie_ids[m] for m in snapshot.graph.person_movies[i]
+            },
+        }
+
+    def __iter__(self):
+        return iter(self.snapshot.person_ids)
+
+    def __len__(self):
+        return len(self.snapshot.person_ids)
+
+
+class Movies(Mapping):
+    """The `movies` dictionary of degrees, read from a snapshot."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, movie_id):
+        snapshot = self.snapshot
+        i = snapshot.graph.movie_index(movie_id)
+        if i is None:
+            raise KeyError(movie_id)
+        return {
+            "title": snapshot.movie_titles[i],
+            "year": snapshot.movie_years[i],
+            "stars": {
+                snapshot.person_ids[p] for p in snapshot.graph.movie_stars[i]
+            },
+        }
+
+    def __iter__(self):
+        return iter(self.snapshot.movie_ids)
+
+    def __len__(self):
+        return len(self.snapshot.movie_ids)
+
+
+class Names(Mapping):
+    """The `names` dictionary of degrees, read from a snapshot."""
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, name):
+        snapshot = self.snapshot
+        people = snapshot.people_named(name)
+        if not people:
+            raise KeyError(name)
+        return {snapshot.person_ids[i] for i in people}
+
+    def __iter__(self):
+        return iter(self.sorted())
+
+    def sorted(self):
+        """
+        Returns the names in order, following the snapshot's name order
+        and merging in the names only people added since have.
+        """
+        snapshot = self.snapshot
+        names = []
+        for i in snapshot.name_order:
+            name = snapshot.person_names[i].lower()
+            if not names or name != names[-1]:
+                names.append(name)
+        added = snapshot.added_only()
+        return list(heapq.merge(names, added)) if added else names
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def gram_sources(self):
+        """
+        Returns gram sources for nameindex.NameIndex covering every name:
+        the snapshot's compiled index, then one over added names.
+        """
+        return [self.snapshot, Grams(self.snapshot.added_only())]
+
+
+def load(directory):
+    """
+    Returns (names, people, movies) mappings over a dataset's snapshot,
+    with its delta applied, and its graph.
+    """
+    snapshot = Snapshot(path_for(directory))
+    snapshot.replay(delta_path_for(directory))
+    return Names(snapshot), People(snapshot), Movies(snapshot), snapshot.graph
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python snapshot.py [directory]")
+    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+
+    print("Compiling snapshot...")
+    compile_snapshot(directory)
+    print(f"Wrote {path_for(directory)}")
+
+
+if __name__ == "__main__":
+    main()
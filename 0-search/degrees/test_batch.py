@@ -0,0 +1,84 @@
+"""
+Checks that updates only drop the cached trees they affect.
+Run with `python -m pytest test_batch.py`.
+"""
+
+import os
+import shutil
+
+import pytest
+
+import batch
+import degrees
+
+SMALL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "small")
+
+KEVIN_BACON = "102"
+TOM_HANKS = "158"
+
+
+@pytest.fixture
+def directory(tmp_path):
+    """A copy of the small dataset, loaded, with a second component."""
+    directory = tmp_path / "small"
+    shutil.copytree(SMALL, directory, ignore=shutil.ignore_patterns("graph.*"))
+    degrees.names, degrees.people, degrees.movies = {}, {}, {}
+    degrees.load_data(str(directory))
+
+    # Two people in a movie of their own, unconnected to everyone else
+    degrees.update_data(
+        str(directory),
+        [{"id": "901", "name": "Ada Island", "birth": ""},
+         {"id": "902", "name": "Bo Island", "birth": ""}],
+        [{"id": "990", "title": "Island", "year": "2020"}],
+        [{"person_id": "901", "movie_id": "990"},
+         {"person_id": "902", "movie_id": "990"}],
+    )
+    return str(directory)
+
+
+def test_invalidate_drops_only_affected_trees(directory):
+    cache = batch.TreeCache(2 ** 20)
+    bacon = degrees.graph.person_index(KEVIN_BACON)
+    ada = degrees.graph.person_index("901")
+    cache.tree(bacon)
+    cache.tree(ada)
+
+    # A new costar for the island movie changes only the island component
+    changed = degrees.update_data(
+        directory,
+        [{"id": "903", "name": "Cy Island", "birth": ""}],
+        [],
+        [{"person_id": "903", "movie_id": "990"}],
+    )
+    cache.invalidate(changed)
+    assert bacon in cache
+    assert ada not in cache
+    assert cache.size == batch.tree_size(cache.get(bacon))
+
+    # The rebuilt tree reaches the new person
+    cy = degrees.graph.person_index("903")
+    assert degrees.tree_path(cache.tree(ada), cy) == [("990", "903")]
+
+
+def test_run_applies_updates_between_queries(directory):
+    cache = batch.TreeCache(2 ** 20)
+    rows = [
+        "Kevin Bacon,Tom Hanks",
+        "Ada Island,Dee Island",
+        "+people,904,Dee Island,",
+        "+stars,904,990",
+        "Ada Island,Dee Island",
+        "Kevin Bacon,Tom Hanks",
+    ]
+    results = batch.run(batch.read_input(rows), cache,
+                        directory=directory)
+
+    assert [result.get("degrees") for result in results] == [1, None, 1, 1]
+    assert results[1]["error"] == "person not found"
+
+    # Kevin Bacon's tree survived the update; Ada's was searched once
+    assert cache.misses == 2
+    assert cache.hits == 1
+    with open(os.path.join(directory, "stars.csv"), encoding="utf-8") as f:
+        assert f.read().splitlines()[-1] == "904,990"
@@ -1,4 +1,9 @@
+from collections import deque
+
+
 class Node():
+    __slots__ = ("state", "parent", "action")
+
     def __init__(self, state, parent, action):
         self.state = state # person_id
         self.parent = parent # The node that lead to this node
@@ -7,13 +12,15 @@ class Node():
 
 class StackFrontier:
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        self.states = set() # States currently in the frontier
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -22,8 +29,8 @@ class StackFrontier:
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.states.discard(node.state)
             return node
 
 
@@ -33,6 +40,6 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.states.discard(node.state)
             return node
@@ -0,0 +1,160 @@
+"""
+Jump Point Search for 4-connected, uniform-cost grid mazes.
+
+Shortest paths are searched in a canonical form in which a path only
+turns from a horizontal move to a vertical one at a "forced" cell: one
+where the same vertical move was blocked from the previous cell. Any
+shortest path can be rewritten into that form without changing its
+length, so runs of cells with a single canonical successor are jumped
+over and only the jump points at their ends go on the A* open list.
+"""
+
+import heapq
+import itertools
+
+# Row and column offsets of each action
+STEPS = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+
+class JumpPointSearch:
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.num_explored = 0
+        self.explored = set()
+
+    def passable(self, i, j):
+        """Returns True if (i, j) is an open cell inside the maze."""
+        return (0 <= i < self.maze.height and 0 <= j < self.maze.width
+                and not self.maze.walls[i][j])
+
+    def jump_horizontal(self, cell, action, goal):
+        """
+        Moves from `cell` along a row until reaching the goal or a cell
+        with a forced vertical neighbor, and returns that cell.
+        Returns None if a wall is hit first.
+        """
+        i, j = cell
+        step = STEPS[action][1]
+        while True:
+            previous = j
+            j += step
+            if not self.passable(i, j):
+                return None
+            if (i, j) == goal:
+                return (i, j)
+            for row in (i - 1, i + 1):
+                if self.passable(row, j) and not self.passable(row, previous):
+                    return (i, j)
+
+    def jump_vertical(self, cell, action, goal):
+        """
+        Moves from `cell` along a column until reaching the goal or a cell
+        from which a horizontal jump finds a jump point, and returns that
+        cell. Returns None if a wall is hit first.
+        """
+        i, j = cell
+        step = STEPS[action][0]
+        while True:
+            i += step
+            if not self.passable(i, j):
+                return None
+            if (i, j) == goal:
+                return (i, j)
+            if (self.jump_horizontal((i, j), "left", goal) is not None
+                    or self.jump_horizontal((i, j), "right", goal) is not None):
+                return (i, j)
+
+    def directions(self, cell, action):
+        """Returns the canonical directions to leave `cell` in."""
+
+        # The start may be left in any direction
+        if action is None:
+            return STEPS.keys()
+
+        # After a vertical move, the path may go on or turn either way
+        if action in ("up", "down"):
+            return (action, "left", "right")
+
+        # After a horizontal move, the path may only turn where forced
+        i, j = cell
+        previous = j - STEPS[action][1]
+        directions = [action]
+        for vertical in ("up", "down"):
+            row = i + STEPS[vertical][0]
+            if self.passable(row, j) and not self.passable(row, previous):
+                directions.append(vertical)
+        return directions
+
+    def successors(self, cell, action, goal):
+        """Yields (action, jump point) pairs reachable from `cell`."""
+        for direction in self.directions(cell, action):
+            if direction in ("up", "down"):
+                point = self.jump_vertical(cell, direction, goal)
+            else:
+                point = self.jump_horizontal(cell, direction, goal)
+            if point is not None:
+                yield direction, point
+
+    def solve(self, start, goal):
+        """
+        Returns a shortest (actions, cells) solution from start to goal,
+        with the jumps between jump points expanded into single moves.
+        Raises an exception if there is no path.
+        """
+
+        def heuristic(cell):
+            return abs(cell[0] - goal[0]) + abs(cell[1] - goal[1])
+
+        # Search states are (cell, action that entered the cell), since the
+        # canonical successors of a cell depend on how it was reached
+        initial = (start, None)
+        cost = {initial: 0}
+        parents = {initial: None}
+        counter = itertools.count()
+        frontier = [(heuristic(start), 0, next(counter), initial)]
+        closed = set()
+
+        while frontier:
+            _, g, _, state = heapq.heappop(frontier)
+            if state in closed:
+                continue
+            closed.add(state)
+            cell, action = state
+            self.num_explored += 1
+
+            if cell == goal:
+                return self.trace(parents, state)
+
+            self.explored.add(cell)
+            for direction, point in self.successors(cell, action, goal):
+                child = (point, direction)
+                distance = abs(point[0] - cell[0]) + abs(point[1] - cell[1])
+                if child in closed or cost.get(child, g + distance + 1) <= g + distance:
+                    continue
+                cost[child] = g + distance
+                parents[child] = state
+                entry = (g + distance + heuristic(point), g + distance,
+                         next(counter), child)
+                heapq.heappush(frontier, entry)
+
+        raise Exception("no solution")
+
+    def trace(self, parents, state):
+        """Expands the jump points leading to `state` into single moves."""
+        points = []
+        while state is not None:
+            points.append(state)
+            state = parents[state]
+        points.reverse()
+
+        actions = []
+        cells = []
+        for (start, _), (end, action) in zip(points, points[1:]):
+            di, dj = STEPS[action]
+            i, j = start
+            while (i, j) != end:
+                i, j = i + di, j + dj
+                actions.append(action)
+                cells.append((i, j))
+        return actions, cells
@@ -0,0 +1,165 @@
+"""
+Landmark distance index for answering many queries on one maze.
+
+BFS distance tables from a handful of landmark cells give, by the
+triangle inequality, a lower bound on the distance between any two cells:
+d(a, b) >= |d(L, b) - d(L, a)| for every landmark L. Used as an A*
+heuristic (the "alt" strategy of `Maze.solve`) this bound is far tighter
+than the Manhattan distance around walls, so queries expand fewer cells.
+Tables are built once and saved to disk for later runs.
+"""
+
+import argparse
+import struct
+import zlib
+
+from array import array
+from collections import deque
+
+# File header: magic, height, width, wall checksum, number of landmarks
+HEADER = struct.Struct("<4sIIII")
+MAGIC = b"ALT2"
+
+
+def wall_checksum(maze):
+    """Returns a CRC-32 of the walls of `maze`, row by row."""
+    checksum = 0
+    for row in maze.walls:
+        checksum = zlib.crc32(bytes(map(bool, row)), checksum)
+    return checksum
+
+
+def distances_from(maze, cell):
+    """
+    Returns the BFS distance from `cell` to every cell of `maze`, as a flat
+    array indexed by row * width + col, with -1 for unreachable cells.
+    """
+    height, width = maze.height, maze.width
+    distances = array("i", [-1]) * (height * width)
+    source = cell[0] * width + cell[1]
+    distances[source] = 0
+    frontier = deque([source])
+    while frontier:
+        index = frontier.popleft()
+        row, col = divmod(index, width)
+        distance = distances[index] + 1
+        for r, c in ((row - 1, col), (row + 1, col),
+                     (row, col - 1), (row, col + 1)):
+            if (0 <= r < height and 0 <= c < width
+                    and not maze.walls[r][c]
+                    and distances[r * width + c] == -1):
+                distances[r * width + c] = distance
+                frontier.append(r * width + c)
+    return distances
+
+
+class LandmarkIndex:
+
+    def __init__(self, height, width, checksum, landmarks, distances):
+        self.height = height
+        self.width = width
+        self.checksum = checksum
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, maze, k=8):
+        """
+        Builds an index of `k` landmarks for `maze`, picked by farthest-point
+        selection: each new landmark is the reachable cell farthest from
+        all the landmarks chosen so far.
+        """
+        width = maze.width
+        landmarks = []
+        distances = []
+
+        # Nearest distance from each cell to any chosen landmark
+        nearest = distances_from(maze, maze.start)
+        for _ in range(k):
+            index = max(range(len(nearest)), key=nearest.__getitem__)
+            if nearest[index] <= 0:
+                break
+            landmark = divmod(index, width)
+            table = distances_from(maze, landmark)
+            landmarks.append(landmark)
+            distances.append(table)
+            for i, distance in enumerate(table):
+                if distance < nearest[i]:
+                    nearest[i] = distance
+
+        return cls(maze.height, width, wall_checksum(maze), landmarks,
+                   distances)
+
+    @classmethod
+    def load(cls, filename, maze=None):
+        """
+        Reads an index written by `save`. If `maze` is given, raises
+        ValueError unless the index was built for a maze of the same size
+        and walls: distances from another maze would make the heuristic
+        overestimate, or index past the tables.
+        """
+        with open(filename, "rb") as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or header[:4] != MAGIC:
+                raise ValueError(f"{filename} is not a landmark index")
+            magic, height, width, checksum, k = HEADER.unpack(header)
+            if maze is not None:
+                if (height, width) != (maze.height, maze.width):
+                    raise ValueError(
+                        f"{filename} was built for a {height}x{width} maze,"
+                        f" not {maze.height}x{maze.width}"
+                    )
+                if checksum != wall_checksum(maze):
+                    raise ValueError(
+                        f"{filename} was built for a maze with other walls"
+                    )
+            cells = array("i")
+            cells.fromfile(f, 2 * k)
+            distances = []
+            for _ in range(k):
+                table = array("i")
+                table.fromfile(f, height * width)
+                distances.append(table)
+        landmarks = list(zip(cells[::2], cells[1::2]))
+        return cls(height, width, checksum, landmarks, distances)
+
+    def save(self, filename):
+        """Writes the index to `filename`."""
+        with open(filename, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.height, self.width,
+                                self.checksum, len(self.landmarks)))
+            array("i", [x for cell in self.landmarks for x in cell]).tofile(f)
+            for table in self.distances:
+                table.tofile(f)
+
+    def heuristic(self, state, goal):
+        """Returns a lower bound on the distance from state to goal."""
+        bound = abs(state[0] - goal[0]) + abs(state[1] - goal[1])
+        s = state[0] * self.width + state[1]
+        g = goal[0] * self.width + goal[1]
+        for table in self.distances:
+            ds = table[s]
+            dg = table[g]
+            if ds >= 0 and dg >= 0 and abs(dg - ds) > bound:
+                bound = abs(dg - ds)
+        return bound
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build a landmark index for a maze."
+    )
+    parser.add_argument("maze", help="maze file to index")
+    parser.add_argument("index", help="file to write the index to")
+    parser.add_argument("-k", type=int, default=8, help="number of landmarks")
+    args = parser.parse_args()
+
+    from compact import CompactMaze
+    m = CompactMaze(args.maze)
+    index = LandmarkIndex.build(m, args.k)
+    index.save(args.index)
+    print(f"Saved {len(index.landmarks)} landmarks to {args.index}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,45 @@
-import sys
+import argparse
+import heapq
+import itertools
+
+from collections import deque
+
+from jps import JumpPointSearch
+from landmarks import LandmarkIndex
+
+# Search strategies understood by Maze.solve
+STRATEGIES = ("dfs", "bfs", "greedy", "astar", "alt", "bidirectional", "jps")
+
+# Maps each action to the action that undoes it
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+
+def manhattan(state, goal):
+    """Returns the Manhattan distance between two cells."""
+    return abs(state[0] - goal[0]) + abs(state[1] - goal[1])
 
 
 class Node:
-    def __init__(self, state, parent, action):
+    __slots__ = ("state", "parent", "action", "cost")
+
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 class StackFrontier:
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        self.states = set()
 
     def add(self, node):
         self.frontier.append(node)
+        self.states.add(node.state)
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
@@ -25,8 +48,8 @@ class StackFrontier:
         if self.empty():
             raise Exception("Frontier is empty")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
+            node = self.frontier.pop()
+            self.states.discard(node.state)
             return node
 
 
@@ -35,11 +58,53 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("Frontier is empty")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
+            node = self.frontier.popleft()
+            self.states.discard(node.state)
             return node
 
 
+class HeapFrontier(StackFrontier):
+    """Frontier that always removes the node with the lowest priority."""
+
+    def __init__(self, goal, heuristic=manhattan):
+        self.frontier = []
+        self.states = set()
+        self.goal = goal
+        self.heuristic = heuristic
+
+        # Breaks ties between equal priorities in insertion order
+        self.counter = itertools.count()
+
+    def priority(self, node):
+        raise NotImplementedError
+
+    def add(self, node):
+        entry = (self.priority(node), next(self.counter), node)
+        heapq.heappush(self.frontier, entry)
+        self.states.add(node.state)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("Frontier is empty")
+        else:
+            node = heapq.heappop(self.frontier)[-1]
+            self.states.discard(node.state)
+            return node
+
+
+class GreedyFrontier(HeapFrontier):
+    def priority(self, node):
+        return self.heuristic(node.state, self.goal)
+
+
+class AStarFrontier(HeapFrontier):
+    def priority(self, node):
+        # Ties are broken towards the shallower node: with a consistent
+        # heuristic on a grid this guarantees the first path found to
+        # any cell is already a shortest one
+        return (node.cost + self.heuristic(node.state, self.goal), node.cost)
+
+
 class Maze():
 
     def __init__(self, filename):
@@ -80,6 +145,7 @@ class Maze():
             self.walls.append(row)
 
         self.solution = None
+        self.landmarks = None
 
 
     def print(self):
@@ -117,15 +183,53 @@ class Maze():
         return result
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def frontier(self, strategy, goal):
+        """Returns an empty frontier implementing a search strategy."""
+        if strategy == "dfs":
+            return StackFrontier()
+        elif strategy == "bfs":
+            return QueueFrontier()
+        elif strategy == "greedy":
+            return GreedyFrontier(goal)
+        elif strategy == "astar":
+            return AStarFrontier(goal)
+        elif strategy == "alt":
+            if self.landmarks is None:
+                raise ValueError("alt strategy needs a landmark index")
+            return AStarFrontier(goal, heuristic=self.landmarks.heuristic)
+        raise ValueError(f"unknown strategy {strategy!r}")
+
+
+    def validate(self, cell):
+        """Raises ValueError unless cell is an open cell of the maze."""
+        i, j = cell
+        if not (0 <= i < self.height and 0 <= j < self.width) or self.walls[i][j]:
+            raise ValueError(f"{cell} is not an open cell")
+
+
+    def solve(self, strategy="dfs", start=None, goal=None):
+        """
+        Finds a solution to maze, if one exists.
+
+        The start and goal default to those marked in the maze file, so a
+        loaded maze can also answer queries between any two open cells.
+        """
+        start = self.start if start is None else tuple(start)
+        goal = self.goal if goal is None else tuple(goal)
+        self.validate(start)
+        self.validate(goal)
+
+        if strategy == "bidirectional":
+            return self.solve_bidirectional(start, goal)
+        if strategy == "jps":
+            return self.solve_jump_points(start, goal)
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
+        start = Node(state=start, parent=None, action=None)
+        frontier = self.frontier(strategy, goal)
         frontier.add(start)
 
         # Initialize an empty explored set
@@ -143,7 +247,7 @@ class Maze():
             self.num_explored += 1
 
             # If node is the goal, then we have a solution
-            if node.state == self.goal:
+            if node.state == goal:
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -161,70 +265,181 @@ class Maze():
             # Add neighbors to frontier
             for action, state in self.neighbors(node.state):
                 if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
+                    child = Node(state=state, parent=node, action=action,
+                                 cost=node.cost + 1)
                     frontier.add(child)
 
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
-        from PIL import Image, ImageDraw
-        cell_size = 50
-        cell_border = 2
-
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
+    def solve_jump_points(self, start, goal):
+        """Finds a shortest solution with Jump Point Search."""
+        search = JumpPointSearch(self)
+        try:
+            self.solution = search.solve(start, goal)
+        finally:
+            self.num_explored = search.num_explored
+            self.explored = search.explored
 
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
 
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
+    def solve_bidirectional(self, start, goal):
+        """
+        Finds a shortest solution by breadth-first searching from both
+        the start and the goal, one layer at a time, until they meet.
+        """
+        self.num_explored = 0
+        self.explored = set()
 
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
+        # Map each reached cell to the (cell, action) it was reached from
+        forward = {start: None}
+        backward = {goal: None}
+        forward_layer = [start]
+        backward_layer = [goal]
 
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
+        meeting = start if start == goal else None
+        while meeting is None:
+            if not forward_layer or not backward_layer:
+                raise Exception("no solution")
 
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
+            # Always grow the side with the smaller frontier
+            if len(forward_layer) <= len(backward_layer):
+                forward_layer, meeting = self.expand_layer(
+                    forward_layer, forward, backward
+                )
+            else:
+                backward_layer, meeting = self.expand_layer(
+                    backward_layer, backward, forward
                 )
 
-        img.save(filename)
+        # Walk back from the meeting cell to the start
+        actions = []
+        cells = []
+        cell = meeting
+        while forward[cell] is not None:
+            previous, action = forward[cell]
+            actions.append(action)
+            cells.append(cell)
+            cell = previous
+        actions.reverse()
+        cells.reverse()
+
+        # Then walk on from the meeting cell to the goal
+        cell = meeting
+        while backward[cell] is not None:
+            cell, action = backward[cell]
+            actions.append(OPPOSITE[action])
+            cells.append(cell)
+
+        self.solution = (actions, cells)
+
+
+    def expand_layer(self, layer, parents, others):
+        """
+        Expands every cell in `layer`, recording new cells in `parents`.
+
+        Returns the next layer, and the first new cell already reached
+        by the other search in `others` (or None).
+        """
+        next_layer = []
+        for cell in layer:
+            self.num_explored += 1
+            self.explored.add(cell)
+            for action, neighbor in self.neighbors(cell):
+                if neighbor not in parents:
+                    parents[neighbor] = (cell, action)
+                    if neighbor in others:
+                        return next_layer, neighbor
+                    next_layer.append(neighbor)
+        return next_layer, None
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+    def output_image(self, filename, show_solution=True, show_explored=False):
+        import numpy as np
+        from PIL import Image
+        cell_size = 50
+        cell_border = 2
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
\ No newline at end of file
+        # Colors, indexed by the code painted into each cell
+        palette = np.array([
+            (0, 0, 0, 255),         # Border
+            (40, 40, 40, 255),      # Walls
+            (255, 0, 0, 255),       # Start
+            (0, 171, 28, 255),      # Goal
+            (220, 235, 113, 255),   # Solution
+            (212, 97, 85, 255),     # Explored
+            (237, 240, 252, 255),   # Empty cell
+        ], dtype=np.uint8)
+
+        # Paint cell codes from the lowest precedence to the highest
+        codes = np.full((self.height, self.width), 6, dtype=np.uint8)
+        solution = self.solution[1] if self.solution is not None else None
+        if solution is not None and show_explored and self.explored:
+            codes[tuple(np.array(list(self.explored)).T)] = 5
+        if solution is not None and show_solution and solution:
+            codes[tuple(np.array(solution).T)] = 4
+        codes[self.goal] = 3
+        codes[self.start] = 2
+        codes[np.asarray(self.walls, dtype=bool)] = 1
+
+        # Expand every cell to a block of pixels surrounded by its border
+        block = np.zeros((cell_size, cell_size), dtype=np.uint8)
+        block[cell_border:cell_size - cell_border + 1,
+              cell_border:cell_size - cell_border + 1] = 1
+        pixels = palette[np.kron(codes, block)]
+
+        Image.fromarray(pixels).save(filename)
+
+
+def cell(text):
+    """Parses an 'i,j' command-line argument into a cell."""
+    i, j = text.split(",")
+    return (int(i), int(j))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a maze.")
+    parser.add_argument("maze", help="maze file to solve")
+    parser.add_argument(
+        "--strategy", choices=STRATEGIES + ("all",), default="dfs",
+        help="search strategy, or 'all' to compare every strategy"
+    )
+    parser.add_argument(
+        "--landmarks", metavar="FILE",
+        help="landmark index built by landmarks.py, for the alt strategy"
+    )
+    parser.add_argument("--start", type=cell, help="start cell as 'i,j'")
+    parser.add_argument("--goal", type=cell, help="goal cell as 'i,j'")
+    parser.add_argument(
+        "--output", default="maze.png",
+        help="image file to render the solution to (default: maze.png)"
+    )
+    parser.add_argument(
+        "--no-image", action="store_true", help="do not render an image"
+    )
+    args = parser.parse_args()
+
+    m = Maze(args.maze)
+    if args.landmarks is not None:
+        m.landmarks = LandmarkIndex.load(args.landmarks, m)
+
+    if args.strategy == "all":
+        print(f"{'Strategy':<15}{'Explored':>10}{'Length':>10}")
+        for strategy in STRATEGIES:
+            if strategy == "alt" and m.landmarks is None:
+                continue
+            m.solve(strategy, args.start, args.goal)
+            length = len(m.solution[0])
+            print(f"{strategy:<15}{m.num_explored:>10}{length:>10}")
+        return
+
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve(args.strategy, args.start, args.goal)
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    if not args.no_image:
+        m.output_image(args.output, show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Solves many maze files in parallel, streaming one JSON line per maze.
+
+Each line reports the maze file, the strategy, the solution length, the
+number of states explored and the wall-clock seconds spent loading and
+solving. Mazes that fail to load or have no solution report an "error"
+instead, and make the command exit with status 1.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from compact import CompactMaze, STRATEGIES as COMPACT_STRATEGIES
+from maze import Maze, STRATEGIES
+
+
+def solve_file(filename, strategy="bfs", compact=False, image_dir=None):
+    """
+    Loads and solves the maze in `filename`, returning a dict of results.
+    If `image_dir` is given, the solved maze is also rendered there.
+    """
+    result = {"maze": filename, "strategy": strategy}
+    start = time.perf_counter()
+    try:
+        m = CompactMaze(filename) if compact else Maze(filename)
+        m.solve(strategy)
+    except Exception as e:
+        result["error"] = str(e)
+    else:
+        result["length"] = len(m.solution[0])
+        result["explored"] = m.num_explored
+        if image_dir is not None:
+            name = os.path.splitext(os.path.basename(filename))[0]
+            m.output_image(os.path.join(image_dir, f"{name}.png"),
+                           show_explored=True)
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def maze_files(paths):
+    """Expands maze files, directories of .txt mazes and globs into files."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "*.txt"))))
+        elif glob.has_magic(path):
+            files.extend(sorted(glob.glob(path)))
+        else:
+            files.append(path)
+    return files
+
+
+def solve_all(files, strategy="bfs", compact=False, image_dir=None,
+              workers=None):
+    """Yields results for every file, in order of completion."""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(solve_file, filename, strategy, compact, image_dir)
+            for filename in files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve maze files in parallel and print JSON lines."
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="maze files, directories or glob patterns"
+    )
+    # Batch runs have no landmark index to give the alt strategy
+    parser.add_argument(
+        "--strategy", default="bfs",
+        choices=[strategy for strategy in STRATEGIES if strategy != "alt"]
+    )
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--compact", action="store_true",
+                        help="load mazes with the compact grid backend "
+                             "(dfs, bfs, greedy or astar only)")
+    parser.add_argument("--images", metavar="DIR", default=None,
+                        help="also render each solved maze into DIR")
+    args = parser.parse_args()
+    if args.compact and args.strategy not in COMPACT_STRATEGIES:
+        parser.error(f"--compact does not support the {args.strategy} "
+                     f"strategy (choose from {', '.join(COMPACT_STRATEGIES)})")
+
+    if args.images is not None:
+        os.makedirs(args.images, exist_ok=True)
+
+    failed = False
+    for result in solve_all(maze_files(args.paths), args.strategy,
+                            args.compact, args.images, args.workers):
+        print(json.dumps(result), flush=True)
+        failed = failed or "error" in result
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
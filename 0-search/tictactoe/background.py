@@ -0,0 +1,69 @@
+"""
+Background AI work for the pygame runners.
+
+The AI runs on a single worker thread, and the game loop hands off to it
+once a frame without waiting. The runner asks Python to switch threads
+every SWITCH_INTERVAL seconds instead of every 5ms when it starts, so the
+loop wakes up on time for each frame even when the AI never blocks.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import tictactoe as ttt
+
+# Seconds a thread may hold the interpreter while another one waits
+SWITCH_INTERVAL = 0.0005
+
+
+class Worker:
+    """Runs one call at a time in a background thread."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+
+    def busy(self):
+        """Returns True from a submit until poll reports it done."""
+        return self.future is not None
+
+    def submit(self, function, *args):
+        """
+        Starts `function(*args)` in the background. Calls submitted while
+        another runs are queued, and run in order.
+        """
+        self.future = self.executor.submit(function, *args)
+
+    def poll(self):
+        """
+        Returns (True, result) once the latest call is done, raising its
+        exception if it failed, or (False, None) while it still runs.
+        """
+        if self.future is None or not self.future.done():
+            return False, None
+        future, self.future = self.future, None
+        return True, future.result()
+
+    def step(self, function, *args):
+        """
+        Advances background work by one frame: submits `function(*args)`
+        if nothing is running, then polls as poll does.
+        """
+        if self.future is None:
+            self.submit(function, *args)
+        return self.poll()
+
+    def cancel(self):
+        """Forgets the latest call, whose result is no longer wanted."""
+        self.future = None
+
+
+def hand_off(worker, think, board):
+    """
+    Does one frame of the AI's turn: starts `think(board)` in the background
+    if it is not running yet, and returns the board with the AI's move
+    played once it is done, or `board` unchanged until then.
+    """
+    done, move = worker.step(think, board)
+    if done:
+        return ttt.result(board, move)
+    return board
@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import bitboard
+import tictactoe as ttt
+
+
+def count_boards(board):
+    """
+    Walks the whole game tree below a list-of-rows board with the public
+    functions of tictactoe. Returns the number of positions visited.
+    """
+    if ttt.terminal(board):
+        return 1
+    return 1 + sum(
+        count_boards(ttt.result(board, action))
+        for action in ttt.actions(board)
+    )
+
+
+def count_bits(x, o):
+    """
+    Walks the whole game tree below a bitboard position.
+    Returns the number of positions visited.
+    """
+    if bitboard.terminal(x, o):
+        return 1
+    positions = 1
+    if bitboard.to_move(x, o):
+        for cell in bitboard.moves(x, o):
+            positions += count_bits(x | 1 << cell, o)
+    else:
+        for cell in bitboard.moves(x, o):
+            positions += count_bits(x, o | 1 << cell)
+    return positions
+
+
+def timed(function, *args):
+    """Returns the result of calling a function and the seconds it took."""
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Count Tic Tac Toe positions searched per second."
+    )
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="keep the best of this many runs")
+    args = parser.parse_args()
+
+    print(f"{'Search':<25}{'Positions':>12}{'Seconds':>10}{'Per second':>14}")
+    for name, function, position in (
+        ("game tree, list boards", count_boards, (ttt.initial_state(),)),
+        ("game tree, bitboards", count_bits, (0, 0)),
+    ):
+        runs = [timed(function, *position) for _ in range(args.repeat)]
+        positions, seconds = min(runs, key=lambda run: run[1])
+        print(f"{name:<25}{positions:>12}{seconds:>10.3f}"
+              f"{positions / seconds:>14,.0f}")
+
+    # Solving from scratch, then answering from the transposition table
+    bitboard.table.clear()
+    _, seconds = timed(ttt.minimax, ttt.initial_state())
+    print(f"first minimax: {seconds * 1e3:.2f}ms, "
+          f"{len(bitboard.table)} table entries")
+    _, seconds = timed(ttt.minimax, ttt.initial_state())
+    print(f"repeat minimax: {seconds * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Bitboard engine for Tic Tac Toe.
+
+A position is a pair of 9-bit integers holding the cells taken by X and
+by O, where bit 3 * i + j stands for cell (i, j). Moves come from the
+bits of the empty-cell mask, and wins are looked up in a table built
+once from the 8 winning lines.
+
+solve searches iteratively deeper under an optional node or time budget,
+trying the most promising moves first, and reports what it did in a
+SearchStats object.
+"""
+
+import math
+import time
+
+# Every cell taken
+FULL = 0b111111111
+
+# The 3 rows, 3 columns and 2 diagonals
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# WINNING[cells] is 1 if a player holding `cells` has three in a row
+WINNING = bytes(
+    any(cells & mask == mask for mask in WIN_MASKS) for cells in range(1 << 9)
+)
+
+# Kinds of transposition table entries: exact values, and the lower and
+# upper bounds left by searches that were cut off
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def symmetries():
+    """
+    Returns the 8 rotations and reflections of the board as permutations
+    of cell indices (3 * i + j): permutation[k] is the cell that moves to
+    cell k.
+    """
+    cells = [(i, j) for i in range(3) for j in range(3)]
+    permutations = []
+    for reflect in (False, True):
+        for turns in range(4):
+            permutation = []
+            for i, j in cells:
+                if reflect:
+                    i, j = i, 2 - j
+                for _ in range(turns):
+                    i, j = j, 2 - i
+                permutation.append(3 * i + j)
+            permutations.append(permutation)
+    return permutations
+
+
+SYMMETRIES = symmetries()
+
+# TRANSFORMS[s][cells] is the 9-bit mask `cells` under symmetry s
+TRANSFORMS = [
+    [
+        sum(1 << k for k in range(9) if cells >> permutation[k] & 1)
+        for cells in range(1 << 9)
+    ]
+    for permutation in SYMMETRIES
+]
+
+# Maps canonical position codes to (value, entry kind, best cell in the
+# canonical position or None, moves searched ahead), shared by every search
+table = {}
+
+# Static move order: the center, then corners, then edges
+PRIORITY = (1, 0, 1, 0, 2, 0, 1, 0, 1)
+
+# Move ordering hints learned from cutoffs: a score per cell (the history
+# heuristic), and the last two cells to cause a cutoff at each number of
+# moves played (killer moves)
+history = [0] * 9
+killers = [[] for _ in range(10)]
+
+# Nodes searched between checks of the clock
+CHECK_EVERY = 256
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a search when its node or time budget runs out."""
+
+
+class SearchStats:
+    """Counters of a search, and the budget it runs under."""
+
+    def __init__(self, max_nodes=None, max_seconds=None):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.table_hits = 0
+        self.depth = 0
+        self.from_book = False
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        self.max_nodes = max_nodes
+        self.deadline = (math.inf if max_seconds is None
+                         else self.started + max_seconds)
+
+    def __str__(self):
+        if self.from_book:
+            return f"opening book, {self.elapsed * 1e3:.3f}ms"
+        return (f"{self.nodes} nodes, {self.cutoffs} cutoffs, "
+                f"{self.table_hits} table hits, depth {self.depth}, "
+                f"{self.elapsed * 1e3:.3f}ms")
+
+    def visit(self):
+        """Counts a node, raising BudgetExceeded if over budget."""
+        self.nodes += 1
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise BudgetExceeded
+        if (self.nodes % CHECK_EVERY == 0
+                and time.perf_counter() > self.deadline):
+            raise BudgetExceeded
+
+    def stop(self):
+        """Records the time taken since the search started."""
+        self.elapsed = time.perf_counter() - self.started
+
+
+def to_move(x, o):
+    """Returns True if X moves next, False if O does."""
+    return x.bit_count() == o.bit_count()
+
+
+def moves(x, o):
+    """Yields the indices of the empty cells, in order."""
+    empty = FULL & ~(x | o)
+    while empty:
+        low = empty & -empty
+        yield low.bit_length() - 1
+        empty ^= low
+
+
+def utility(x, o):
+    """Returns 1 if X has won, -1 if O has won, 0 otherwise."""
+    if WINNING[x]:
+        return 1
+    elif WINNING[o]:
+        return -1
+    return 0
+
+
+def terminal(x, o):
+    """Returns True if the game is over."""
+    return bool(WINNING[x] or WINNING[o]) or x | o == FULL
+
+
+def canonical(x, o):
+    """
+    Returns the smallest code (x << 9 | o) of the position over its 8
+    symmetries, and the permutation of cell indices giving that code.
+    """
+    best = None
+    for transform, permutation in zip(TRANSFORMS, SYMMETRIES):
+        code = transform[x] << 9 | transform[o]
+        if best is None or code < best[0]:
+            best = (code, permutation)
+    return best
+
+
+def ordered(x, o, first=None):
+    """
+    Returns the empty cells in the order to search them: `first` (the
+    table's best cell), killer moves, then by history and static priority.
+    """
+    ply = (x | o).bit_count()
+    return sorted(
+        moves(x, o),
+        key=lambda cell: (cell == first, cell in killers[ply],
+                          history[cell], PRIORITY[cell]),
+        reverse=True,
+    )
+
+
+def search(x, o, alpha=-math.inf, beta=math.inf, depth=None, stats=None):
+    """
+    Returns the minimax value of the position and the best cell index for
+    the player to move (None if the game is over), searching `depth` moves
+    ahead (by default, to the end of the game) with alpha-beta pruning.
+    Positions past the depth are scored as draws.
+
+    Results are kept in the transposition table under the position's
+    canonical code, so symmetric positions and positions reached through
+    different move orders are only searched once. A value found with a
+    narrowed window is stored as the bound it really is, and a value is
+    only reused for searches no deeper than the one that found it.
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.visit()
+    empty = 9 - (x | o).bit_count()
+    depth = empty if depth is None else min(depth, empty)
+
+    code, permutation = canonical(x, o)
+    entry = table.get(code)
+    first = None
+    if entry is not None:
+        value, kind, cell, searched = entry
+        first = None if cell is None else permutation[cell]
+        if searched >= depth and (kind == EXACT
+                                  or kind == LOWER and value >= beta
+                                  or kind == UPPER and value <= alpha):
+            stats.table_hits += 1
+            return value, first
+
+    if terminal(x, o):
+        table[code] = (utility(x, o), EXACT, None, 9)
+        return utility(x, o), None
+    if depth == 0:
+        return 0, None
+
+    maximizing = to_move(x, o)
+    alpha_start, beta_start = alpha, beta
+    best_value = -math.inf if maximizing else math.inf
+    best_cell = None
+
+    for cell in ordered(x, o, first):
+        if maximizing:
+            value = search(x | 1 << cell, o, alpha, beta, depth - 1, stats)[0]
+            if value > best_value:
+                best_value, best_cell = value, cell
+                alpha = max(alpha, value)
+        else:
+            value = search(x, o | 1 << cell, alpha, beta, depth - 1, stats)[0]
+            if value < best_value:
+                best_value, best_cell = value, cell
+                beta = min(beta, value)
+        if alpha >= beta:
+            stats.cutoffs += 1
+            history[cell] += depth * depth
+            ply_killers = killers[9 - empty]
+            if cell not in ply_killers:
+                ply_killers.insert(0, cell)
+                del ply_killers[2:]
+            break
+
+    if best_value <= alpha_start:
+        kind = UPPER
+    elif best_value >= beta_start:
+        kind = LOWER
+    else:
+        kind = EXACT
+    table[code] = (best_value, kind, permutation.index(best_cell), depth)
+    return best_value, best_cell
+
+
+def solve(x, o, stats=None):
+    """
+    Searches one move deeper at a time, until the end of the game or the
+    budget of `stats` runs out. Returns the value and best cell found by
+    the deepest complete search, or (None, None) if the game is over.
+    """
+    if stats is None:
+        stats = SearchStats()
+    if terminal(x, o):
+        stats.stop()
+        return None, None
+
+    # If not even one move ahead can be searched, play by static order
+    best = (None, ordered(x, o)[0])
+    try:
+        for depth in range(1, 10 - (x | o).bit_count()):
+            best = search(x, o, depth=depth, stats=stats)
+            stats.depth = depth
+    except BudgetExceeded:
+        pass
+    stats.stop()
+    return best
@@ -0,0 +1,95 @@
+"""
+Perfect-play opening book for Tic Tac Toe.
+
+`python book.py` solves every reachable position once with the search
+behind tictactoe.minimax and writes `book.bin`: one byte for each of the
+3^9 boards, indexed by the board's base-3 code (a cell is 0 if empty, 1
+for X, 2 for O, and cell 3 * i + j is digit 3 * i + j). The low nibble
+of a byte is the best cell, the next two bits the minimax value plus 1;
+unreachable and finished boards hold UNKNOWN.
+
+tictactoe.minimax reads the book on first use, then answers each move
+with a single lookup. Without a book file it falls back to searching.
+"""
+
+import os
+import sys
+
+import bitboard
+
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "book.bin")
+UNKNOWN = 0xFF
+
+# POWERS[cells] is the base-3 code of the 9-bit mask `cells` as all X
+POWERS = [
+    sum(3 ** k for k in range(9) if cells >> k & 1) for cells in range(1 << 9)
+]
+
+# Book entries, read on first use (empty if there is no book)
+entries = None
+
+
+def code(x, o):
+    """Returns the base-3 code of a bitboard position."""
+    return POWERS[x] + 2 * POWERS[o]
+
+
+def build():
+    """Returns the book entries for every position reachable by play."""
+    book = bytearray([UNKNOWN]) * 3 ** 9
+    stack = [(0, 0)]
+    while stack:
+        x, o = stack.pop()
+        index = code(x, o)
+        if book[index] != UNKNOWN or bitboard.terminal(x, o):
+            continue
+        value, cell = bitboard.search(x, o)
+        book[index] = (value + 1) << 4 | cell
+        for move in bitboard.moves(x, o):
+            if bitboard.to_move(x, o):
+                stack.append((x | 1 << move, o))
+            else:
+                stack.append((x, o | 1 << move))
+    return bytes(book)
+
+
+def load(path=BOOK):
+    """Reads the book, if there is one, so lookups need no disk access."""
+    global entries
+    try:
+        with open(path, "rb") as f:
+            entries = f.read()
+    except FileNotFoundError:
+        entries = b""
+    return entries
+
+
+def lookup(x, o):
+    """
+    Returns (value, best cell) for a position from the book, or None if
+    the book does not have it.
+    """
+    if entries is None:
+        load()
+    if not entries:
+        return None
+    entry = entries[code(x, o)]
+    if entry == UNKNOWN:
+        return None
+    return (entry >> 4) - 1, entry & 0xF
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [book]")
+    path = sys.argv[1] if len(sys.argv) == 2 else BOOK
+
+    book = build()
+    with open(path, "wb") as f:
+        f.write(book)
+    known = sum(entry != UNKNOWN for entry in book)
+    print(f"Wrote {known} positions to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+m,n,k games: Tic Tac Toe played on an m x n board and won by k in a row
+(Tic Tac Toe itself is 3,3,3, and gomoku 15,15,5).
+
+Game offers the functions of tictactoe as methods, on boards of the same
+lists of rows. Its minimax runs iterative-deepening alpha-beta search
+under a time budget, so it answers in bounded time on boards too large
+to solve, while boards small enough are still solved exactly. Moves are
+scored incrementally: placing a stone only updates the lines of k cells
+("windows") through it, which keeps a running evaluation of the position
+and detects a win from the last move alone.
+"""
+
+import argparse
+import math
+import time
+
+from tictactoe import EMPTY, O, X
+
+# Distance from the nearest stone within which empty cells are searched
+RADIUS = 2
+
+# Nodes searched between checks of the clock
+CHECK_EVERY = 512
+
+
+class Timeout(Exception):
+    """Raised inside a search when its time budget has run out."""
+
+
+class Game:
+
+    def __init__(self, m=3, n=3, k=3, budget=1.0):
+        """
+        Creates a game on a board of `m` rows and `n` columns won by `k`
+        in a row, whose AI thinks for at most `budget` seconds a move.
+        """
+        if not 1 <= k <= max(m, n):
+            raise ValueError("k must be between 1 and the longest side")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.budget = budget
+
+        # Any win outscores the evaluation of every unfinished position
+        self.win_score = 1000 * 10 ** k
+
+        # Every line of k cells, as flat cell indices (i * n + j)
+        self.windows = []
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for i in range(m):
+                for j in range(n):
+                    if (0 <= i + (k - 1) * di < m
+                            and 0 <= j + (k - 1) * dj < n):
+                        self.windows.append([
+                            (i + t * di) * n + j + t * dj for t in range(k)
+                        ])
+
+        # The windows through each cell, and the cells near each cell
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(w)
+        self.neighborhoods = [
+            [
+                a * n + b
+                for a in range(max(0, i - RADIUS), min(m, i + RADIUS + 1))
+                for b in range(max(0, j - RADIUS), min(n, j + RADIUS + 1))
+                if (a, b) != (i, j)
+            ]
+            for i in range(m) for j in range(n)
+        ]
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        cells = [value for row in board for value in row]
+        return X if cells.count(X) == cells.count(O) else O
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {
+            (i, j)
+            for i, row in enumerate(board)
+            for j, value in enumerate(row)
+            if value == EMPTY
+        }
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n) or board[i][j] != EMPTY:
+            raise ValueError("given action has already been taken")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        Returns None if there is no winner.
+        """
+        cells = [value for row in board for value in row]
+        for window in self.windows:
+            first = cells[window[0]]
+            if first != EMPTY and all(cells[cell] == first for cell in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None
+                or all(EMPTY not in row for row in board))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        return {X: 1, O: -1, None: 0}[self.winner(board)]
+
+    def minimax(self, board, budget=None):
+        """
+        Returns the best action found for the current player on the board
+        within `budget` seconds (by default, the game's budget).
+        """
+        if self.terminal(board):
+            return None
+        search = Search(self, board)
+        return divmod(search.best_move(budget or self.budget), self.n)
+
+
+class Search:
+    """A position being searched, updated in place as moves are tried."""
+
+    def __init__(self, game, board):
+        self.game = game
+        self.cells = [EMPTY] * (game.m * game.n)
+        self.x_counts = [0] * len(game.windows)
+        self.o_counts = [0] * len(game.windows)
+        self.near = [0] * len(self.cells)
+        self.moves = []
+        self.score = 0
+        self.won = False
+        self.nodes = 0
+        self.deadline = math.inf
+        self.horizon = False
+
+        # Replay the stones on the board
+        flat = [value for row in board for value in row]
+        for value in (X, O):
+            for cell, other in enumerate(flat):
+                if other == value:
+                    self.place(cell, value)
+        self.turn = X if flat.count(X) == flat.count(O) else O
+
+    def window_score(self, w):
+        """Returns the value of a window to X: its stones if unblocked."""
+        x, o = self.x_counts[w], self.o_counts[w]
+        if o == 0 and x:
+            return 10 ** x
+        elif x == 0 and o:
+            return -10 ** o
+        return 0
+
+    def place(self, cell, value):
+        """Puts a stone on a cell, updating windows, score and nearness."""
+        counts = self.x_counts if value == X else self.o_counts
+        for w in self.game.cell_windows[cell]:
+            self.score -= self.window_score(w)
+            counts[w] += 1
+            if counts[w] == self.game.k:
+                self.won = True
+            self.score += self.window_score(w)
+        for other in self.game.neighborhoods[cell]:
+            self.near[other] += 1
+        self.cells[cell] = value
+        self.moves.append(cell)
+
+    def play(self, cell):
+        """Plays a move for the player to move."""
+        self.place(cell, self.turn)
+        self.turn = O if self.turn == X else X
+
+    def undo(self):
+        """Takes back the last move played."""
+        cell = self.moves.pop()
+        self.turn = self.cells[cell]
+        counts = self.x_counts if self.turn == X else self.o_counts
+        for w in self.game.cell_windows[cell]:
+            self.score -= self.window_score(w)
+            counts[w] -= 1
+            self.score += self.window_score(w)
+        for other in self.game.neighborhoods[cell]:
+            self.near[other] -= 1
+        self.cells[cell] = EMPTY
+        self.won = False
+
+    def candidates(self):
+        """
+        Returns the empty cells worth trying, nearest the last stone first:
+        those near any stone, or every empty cell if there are none.
+        """
+        game = self.game
+        empty = [cell for cell, value in enumerate(self.cells)
+                 if value == EMPTY]
+        near = [cell for cell in empty if self.near[cell]]
+        if not self.moves:
+            center = (game.m // 2) * game.n + game.n // 2
+            return [center] + [cell for cell in empty if cell != center]
+        if not near:
+            near = empty
+
+        last_i, last_j = divmod(self.moves[-1], game.n)
+
+        def distance(cell):
+            i, j = divmod(cell, game.n)
+            return max(abs(i - last_i), abs(j - last_j))
+
+        return sorted(near, key=distance)
+
+    def negamax(self, depth, alpha, beta):
+        """
+        Returns the value of the position to the player to move, searching
+        `depth` moves ahead with alpha-beta pruning.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+
+        # The last move won; losing later is better than losing sooner
+        if self.won:
+            return -(self.game.win_score - len(self.moves))
+
+        moves = self.candidates()
+        if not moves:
+            return 0
+        if depth == 0:
+            self.horizon = True
+            return self.score if self.turn == X else -self.score
+
+        best = -math.inf
+        for cell in moves:
+            self.play(cell)
+            value = -self.negamax(depth - 1, -beta, -alpha)
+            self.undo()
+            best = max(best, value)
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        return best
+
+    def best_move(self, budget):
+        """
+        Searches one move deeper at a time until the budget runs out or
+        the game is solved. Returns the best move of the last complete
+        depth, trying it first at the next depth.
+        """
+        self.deadline = time.perf_counter() + budget
+        moves = self.candidates()
+        best = moves[0]
+        for depth in range(1, len(moves) + 1):
+            self.horizon = False
+            scores = {}
+            alpha = -math.inf
+            depth_best = best
+            try:
+                for cell in moves:
+                    self.play(cell)
+                    scores[cell] = -self.negamax(depth - 1, -math.inf, -alpha)
+                    self.undo()
+                    if scores[cell] > alpha:
+                        alpha, depth_best = scores[cell], cell
+            except Timeout:
+                break
+            best = depth_best
+            moves.sort(key=lambda cell: scores[cell], reverse=True)
+
+            # Stop once every line was followed to the end of the game,
+            # or a forced win or loss was found
+            if not self.horizon or abs(alpha) > self.game.win_score // 2:
+                break
+        return best
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Let the m,n,k AI play itself, timing each move."
+    )
+    parser.add_argument("m", type=int, help="rows")
+    parser.add_argument("n", type=int, help="columns")
+    parser.add_argument("k", type=int, help="stones in a row to win")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="seconds per move")
+    args = parser.parse_args()
+
+    game = Game(args.m, args.n, args.k, args.budget)
+    board = game.initial_state()
+    while not game.terminal(board):
+        start = time.perf_counter()
+        action = game.minimax(board)
+        elapsed = time.perf_counter() - start
+        print(f"{game.player(board)} plays {action} in {elapsed:.3f}s")
+        board = game.result(board, action)
+
+    for row in board:
+        print(" ".join(value or "." for value in row))
+    winner = game.winner(board)
+    print("Tie." if winner is None else f"{winner} wins.")
+
+
+if __name__ == "__main__":
+    main()
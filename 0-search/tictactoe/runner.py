@@ -2,8 +2,12 @@ import pygame
 import sys
 import time
 
+import bitboard
+import book
 import tictactoe as ttt
 
+from background import SWITCH_INTERVAL, Worker, hand_off
+
 pygame.init()
 size = width, height = 600, 400
 
@@ -17,9 +21,31 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+# Most seconds the AI may think about a move
+AI_SECONDS = 1.0
+
+# Frames drawn per second, while the AI thinks too
+FPS = 60
+
+# The AI thinks in a background thread, so the window keeps responding
+sys.setswitchinterval(SWITCH_INTERVAL)
+worker = Worker()
+clock = pygame.time.Clock()
+
+
+def think(board):
+    """Returns the AI's move, searching for at most AI_SECONDS."""
+    stats = bitboard.SearchStats(max_seconds=AI_SECONDS)
+    move = ttt.minimax(board, stats)
+    print(f"AI plays {move}: {stats}")
+    return move
+
+
+# Read the opening book now, so the AI's first move is a lookup too
+book.load()
+
 user = None
 board = ttt.initial_state()
-ai_turn = False
 
 while True:
 
@@ -102,21 +128,16 @@ while True:
         elif user == player:
             title = f"Play as {user}"
         else:
-            title = f"Computer thinking..."
+            dots = "." * (pygame.time.get_ticks() // 400 % 3 + 1)
+            title = f"Computer thinking{dots:<3}"
         title = largeFont.render(title, True, white)
         titleRect = title.get_rect()
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, started in the background and played once done
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            board = hand_off(worker, think, board)
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
@@ -141,6 +162,7 @@ while True:
                     time.sleep(0.2)
                     user = None
                     board = ttt.initial_state()
-                    ai_turn = False
+                    worker.cancel()
 
     pygame.display.flip()
+    clock.tick(FPS)
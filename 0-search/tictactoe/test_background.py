@@ -0,0 +1,87 @@
+"""
+Checks that handing the AI's turn to the background worker keeps frames
+on time while it thinks. Run with `python -m pytest test_background.py`;
+set STRICT_FRAMES=1 to also fail on any single late frame.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+import tictactoe as ttt
+
+from background import SWITCH_INTERVAL, Worker, hand_off
+
+FPS = 60
+FRAME = 1 / FPS
+
+# Seconds the stub AI computes for, without ever releasing the interpreter
+THINK_SECONDS = 1.0
+
+
+@pytest.fixture
+def switching():
+    """Switches threads as the runner does, restoring the interval after."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(SWITCH_INTERVAL)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def slow_minimax(board):
+    """Spins in Python for THINK_SECONDS, then plays the first empty cell."""
+    end = time.perf_counter() + THINK_SECONDS
+    count = 0
+    while time.perf_counter() < end:
+        count += 1
+    return min(ttt.actions(board))
+
+
+def frame_times(step):
+    """Calls `step` once a frame at FPS until it returns True."""
+    frames = []
+    last = time.perf_counter()
+    while not step():
+        time.sleep(max(0, last + FRAME - time.perf_counter()))
+        now = time.perf_counter()
+        frames.append(now - last)
+        last = now
+    return frames
+
+
+def test_hand_off_keeps_frames_on_time(switching):
+    worker = Worker()
+    board = ttt.initial_state()
+
+    def step():
+        nonlocal board
+        board = hand_off(worker, slow_minimax, board)
+        return board != ttt.initial_state()
+
+    frames = frame_times(step)
+    assert board[0][0] == ttt.X
+    assert not worker.busy()
+    assert len(frames) >= THINK_SECONDS * FPS * 0.8
+    assert statistics.median(frames) < FRAME * 1.15
+    if os.environ.get("STRICT_FRAMES"):
+        assert max(frames) < FRAME * 2
+
+
+def test_hand_off_returns_board_until_done():
+    worker = Worker()
+    board = ttt.initial_state()
+    worker.submit(time.sleep, 0.05)
+    assert hand_off(worker, slow_minimax, board) is board
+    worker.cancel()
+
+
+def test_cancel_drops_the_pending_move():
+    worker = Worker()
+    worker.submit(time.sleep, 0.05)
+    assert worker.busy()
+    worker.cancel()
+    assert not worker.busy()
+    assert worker.poll() == (False, None)
@@ -1,8 +1,13 @@
 """
 Tic Tac Toe Player
+
+The functions below take and return boards as lists of rows, and are
+thin adapters over the bitboard engine in bitboard.py that does the work.
+minimax answers from the opening book (see book.py) when one is built.
 """
 
-import math
+import bitboard
+import book
 
 X = "X"
 O = "O"
@@ -17,23 +22,24 @@ def initial_state():
     return [[EMPTY, EMPTY, EMPTY], [EMPTY, EMPTY, EMPTY], [EMPTY, EMPTY, EMPTY]]
 
 
-def player(board):
+def to_bits(board):
     """
-    Returns player who has the next turn on a board.
+    Returns the bitboards (x, o) of the cells taken by X and by O.
     """
-    num_moves_taken_X = 0
-    num_moves_taken_O = 0
+    x = o = 0
+    for k, value in enumerate(value for row in board for value in row):
+        if value == X:
+            x |= 1 << k
+        elif value == O:
+            o |= 1 << k
+    return x, o
 
-    for row in board:
-        for value in row:
-            if value == X:
-                num_moves_taken_X += 1
-            elif value == O:
-                num_moves_taken_O += 1
 
-    if num_moves_taken_X == num_moves_taken_O:
-        return X
-    return O
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    return X if bitboard.to_move(*to_bits(board)) else O
 
 
 def actions(board):
@@ -41,30 +47,22 @@ def actions(board):
     Returns set of all possible actions (i, j) available on the board.
     (i = row index, j = column index)
     """
-    actions = set()
-    for i, row in enumerate(board):
-        for j, value in enumerate(row):
-            if value == EMPTY:
-                actions.add((i, j))
-    return actions
+    return {divmod(cell, 3) for cell in bitboard.moves(*to_bits(board))}
 
 
 def result(board, action):
     """
     Returns the board that results from making move (i, j) on the board.
     """
+    x, o = to_bits(board)
+    i, j = action
+
     # Check action is possible
-    if not action in actions(board):
+    if not (0 <= i < 3 and 0 <= j < 3) or (x | o) >> (3 * i + j) & 1:
         raise ValueError("given action has already been taken")
 
-    moving_player = player(board)
-
-    i, j = action
-
     new_board = [row[:] for row in board]
-
-    new_board[i][j] = moving_player
-
+    new_board[i][j] = X if bitboard.to_move(x, o) else O
     return new_board
 
 
@@ -73,112 +71,39 @@ def winner(board):
     Returns the winner of the game, if there is one.
     Returns None if there is no winner.
     """
-    # Check Rows
-    for row in board:
-        if row[0] != EMPTY and row[0] == row[1] == row[2]:
-            return row[0]
-
-    # Check Columns
-    for j in range(3):
-        if board[0][j] != EMPTY and board[0][j] == board[1][j] == board[2][j]:
-            return board[0][j]
-
-    # Check Diagonals
-    if board[0][0] != EMPTY and board[0][0] == board[1][1] == board[2][2]:
-        return board[0][0]
-
-    if board[0][2] != EMPTY and board[0][2] == board[1][1] == board[2][0]:
-        return board[0][2]
-
-    # No Winner
-    return None
+    return {1: X, -1: O, 0: None}[utility(board)]
 
 
 def terminal(board):
     """
     Returns True if game is over, False otherwise.
     """
-    if winner(board):
-        return True
-
-    # Check if tie
-    if all(EMPTY not in row for row in board):
-        return True
-
-    return False
+    return bitboard.terminal(*to_bits(board))
 
 
 def utility(board):
     """
     Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
     """
-    winning_player = winner(board)
-    if winning_player == X:
-        return 1
-    elif winning_player == O:
-        return -1
-    else:
-        return 0
+    return bitboard.utility(*to_bits(board))
 
 
-def minimax(board):
+def minimax(board, stats=None):
     """
     Returns the optimal action for the current player on the board.
+
+    `stats`, a bitboard.SearchStats, can limit the search to a number of
+    nodes or seconds (returning the best action found in time) and
+    collects what the search did.
     """
-    if terminal(board):
+    x, o = to_bits(board)
+    if bitboard.terminal(x, o):
         return None
-
-    def max_value(board, alpha=-math.inf, beta=math.inf):
-        if terminal(board):
-            return utility(board)
-
-        v = -math.inf
-
-        for action in actions(board):
-            v = max(v, min_value(result(board, action), alpha, beta))
-
-            alpha = max(alpha, v)
-            if alpha >= beta:
-                break
-
-        return v
-
-    def min_value(board, alpha=-math.inf, beta=math.inf):
-        if terminal(board):
-            return utility(board)
-
-        v = math.inf
-
-        for action in actions(board):
-            v = min(v, max_value(result(board, action), alpha, beta))
-
-            beta = min(beta, v)
-            if alpha >= beta:
-                break
-
-        return v
-
-    current_player = player(board)
-    best_action = None
-    alpha = -math.inf
-    beta = math.inf
-
-    if current_player == X:
-        best_value = -math.inf
-        for action in actions(board):
-            value = min_value(result(board, action), alpha, beta)
-            if value > best_value:
-                best_value = value
-                best_action = action
-            alpha = max(alpha, best_value)
-    else:
-        best_value = math.inf
-        for action in actions(board):
-            value = max_value(result(board, action), alpha, beta)
-            if value < best_value:
-                best_value = value
-                best_action = action
-            beta = min(beta, best_value)
-
-
-    return best_action
+    if stats is None:
+        stats = bitboard.SearchStats()
+    entry = book.lookup(x, o)
+    if entry is not None:
+        stats.from_book = True
+        stats.stop()
+        return divmod(entry[1], 3)
+    return divmod(bitboard.solve(x, o, stats)[1], 3)
@@ -0,0 +1,188 @@
+"""
+Headless Tic Tac Toe tournament between AI agents.
+
+Every pair of agents plays a number of games, each agent taking X in
+half of them, spread over a process pool. Prints each pairing's win and
+draw rates, then each agent's moves per second and the percentiles of
+the time it took per move. Each agent searches with a transposition
+table of its own, so results do not depend on the other agents in the
+run or on how matches are spread over the workers.
+"""
+
+import argparse
+import itertools
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+import bitboard
+import mnk
+import tictactoe as ttt
+
+
+def random_agent(rng):
+    """Plays a random empty cell."""
+    return lambda board: rng.choice(sorted(ttt.actions(board)))
+
+
+def search_agent(rng):
+    """Plays perfectly by searching, without the opening book."""
+    return lambda board: divmod(bitboard.solve(*ttt.to_bits(board))[1], 3)
+
+
+def shallow_agent(rng):
+    """
+    Plays the best move found by searching within a budget of 50 nodes,
+    without the opening book.
+    """
+    return lambda board: divmod(bitboard.solve(
+        *ttt.to_bits(board), bitboard.SearchStats(max_nodes=50)
+    )[1], 3)
+
+
+def mnk_agent(rng):
+    """Plays with the m,n,k engine, thinking for at most 0.1s."""
+    return mnk.Game(3, 3, 3, budget=0.1).minimax
+
+
+# Agents by name, as functions of a random number generator returning a
+# function from boards to actions
+AGENTS = {
+    "random": random_agent,
+    "minimax": lambda rng: ttt.minimax,
+    "search": search_agent,
+    "shallow": shallow_agent,
+    "mnk": mnk_agent,
+}
+
+
+def isolated(agent):
+    """
+    Wraps an agent so its searches use a transposition table and move
+    ordering hints of its own, which bitboard otherwise shares between
+    every search in the process, so that no agent plays on what another
+    agent (or another match in the same worker) has searched.
+    """
+    state = ({}, [0] * 9, [[] for _ in range(10)])
+
+    def play(board):
+        shared = bitboard.table, bitboard.history, bitboard.killers
+        bitboard.table, bitboard.history, bitboard.killers = state
+        try:
+            return agent(board)
+        finally:
+            bitboard.table, bitboard.history, bitboard.killers = shared
+
+    return play
+
+
+def play_games(x_name, o_name, games, seed):
+    """
+    Plays `games` games of agent `x_name` as X against `o_name` as O.
+    Returns the number of X wins, O wins and draws, and lists of the
+    seconds X and O took for each of their moves.
+    """
+    rng = random.Random(seed)
+    agents = {
+        ttt.X: isolated(AGENTS[x_name](rng)),
+        ttt.O: isolated(AGENTS[o_name](rng)),
+    }
+    outcomes = {ttt.X: 0, ttt.O: 0, None: 0}
+    latencies = {ttt.X: [], ttt.O: []}
+
+    for _ in range(games):
+        board = ttt.initial_state()
+        while not ttt.terminal(board):
+            player = ttt.player(board)
+            start = time.perf_counter()
+            action = agents[player](board)
+            latencies[player].append(time.perf_counter() - start)
+            board = ttt.result(board, action)
+        outcomes[ttt.winner(board)] += 1
+
+    return (outcomes[ttt.X], outcomes[ttt.O], outcomes[None],
+            latencies[ttt.X], latencies[ttt.O])
+
+
+def entrants(names):
+    """
+    Returns a label for each agent in a run, numbering repeated agents
+    (shallow, shallow#2) so an agent can play itself.
+    """
+    labels = []
+    for i, name in enumerate(names):
+        repeats = names[:i].count(name)
+        labels.append(f"{name}#{repeats + 1}" if repeats else name)
+    return labels
+
+
+def percentile(values, fraction):
+    """Returns the value at a fraction of the way through sorted values."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Tic Tac Toe agents against each other."
+    )
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS),
+                        default=["random", "minimax", "shallow"])
+    parser.add_argument("--games", type=int, default=100,
+                        help="games per pairing")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if len(args.agents) < 2:
+        parser.error("at least two agents are needed")
+    labels = entrants(args.agents)
+
+    # Each pairing plays half its games with either agent as X
+    matches = []
+    for a, b in itertools.combinations(range(len(labels)), 2):
+        matches.append((a, b, (args.games + 1) // 2))
+        matches.append((b, a, args.games // 2))
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        results = list(executor.map(
+            play_games,
+            [args.agents[x] for x, _, _ in matches],
+            [args.agents[o] for _, o, _ in matches],
+            [games for _, _, games in matches],
+            [args.seed + i for i in range(len(matches))],
+        ))
+
+    records = {}
+    latencies = {label: [] for label in labels}
+    for (x, o, _), (x_wins, o_wins, draws, x_times, o_times) in zip(
+        matches, results
+    ):
+        wins = records.setdefault(tuple(sorted((x, o))), {x: 0, o: 0, None: 0})
+        wins[x] += x_wins
+        wins[o] += o_wins
+        wins[None] += draws
+        latencies[labels[x]].extend(x_times)
+        latencies[labels[o]].extend(o_times)
+
+    print(f"{'Pairing':<25}{'Wins':>8}{'Losses':>8}{'Draws':>8}")
+    for (a, b), wins in records.items():
+        games = sum(wins.values())
+        print(f"{labels[a] + ' vs ' + labels[b]:<25}{wins[a] / games:>8.1%}"
+              f"{wins[b] / games:>8.1%}{wins[None] / games:>8.1%}")
+
+    print()
+    print(f"{'Agent':<10}{'Moves':>8}{'Moves/s':>12}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label in labels:
+        seconds = sorted(latencies[label])
+        if not seconds:
+            continue
+        print(f"{label:<10}{len(seconds):>8}"
+              f"{len(seconds) / sum(seconds):>12,.0f}"
+              + "".join(f"{percentile(seconds, q) * 1e3:>10.3f}"
+                        for q in (0.5, 0.9, 0.99, 1)))
+
+
+if __name__ == "__main__":
+    main()
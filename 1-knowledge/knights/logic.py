@@ -1,5 +1,8 @@
 import itertools
 
+# Models evaluated at once per NumPy array by the "vectorized" backend
+BLOCK_BITS = 20
+
 
 class Sentence():
 
@@ -15,6 +18,51 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def expression(self, variables, vectorized=False):
+        """
+        Returns a Python expression for the sentence, given the expression
+        for each symbol's value, using boolean operators (or bitwise ones
+        on NumPy arrays if `vectorized`).
+        """
+        raise Exception("nothing to compile")
+
+    def compile(self, symbols, bitmask=False):
+        """
+        Returns a function evaluating the sentence as one flat expression,
+        over a tuple of truth values for `symbols`, in order, or over an
+        int whose bit i is the value of symbols[i] if `bitmask`.
+        """
+        template = "(m >> {} & 1)" if bitmask else "m[{}]"
+        variables = {
+            symbol: template.format(i) for i, symbol in enumerate(symbols)
+        }
+        return eval(f"lambda m: bool({self.expression(variables)})")
+
+    def truth_tables(self, symbols):
+        """
+        Yields the sentence's value in every model of `symbols`, as NumPy
+        boolean arrays over consecutive blocks of models: model k gives
+        symbols[i] the value of bit i of k.
+        """
+        import numpy as np
+        low = min(len(symbols), BLOCK_BITS)
+        models = np.arange(2 ** low, dtype=np.uint32)
+        columns = [(models >> i & 1).astype(bool) for i in range(low)]
+        variables = {
+            symbol: f"c[{i}]" for i, symbol in enumerate(symbols)
+        }
+        function = eval(
+            f"lambda c: {self.expression(variables, vectorized=True)}",
+            {"np": np},
+        )
+
+        # Symbols past the low bits are constant within a block
+        for block in range(2 ** (len(symbols) - low)):
+            constants = [
+                np.bool_(block >> i & 1) for i in range(len(symbols) - low)
+            ]
+            yield np.broadcast_to(function(columns + constants), models.shape)
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -68,6 +116,12 @@ class Symbol(Sentence):
     def symbols(self):
         return {self.name}
 
+    def expression(self, variables, vectorized=False):
+        try:
+            return variables[self.name]
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
 
 class Not(Sentence):
     def __init__(self, operand):
@@ -92,6 +146,10 @@ class Not(Sentence):
     def symbols(self):
         return self.operand.symbols()
 
+    def expression(self, variables, vectorized=False):
+        operand = self.operand.expression(variables, vectorized)
+        return f"(~{operand})" if vectorized else f"(not {operand})"
+
 
 class And(Sentence):
     def __init__(self, *conjuncts):
@@ -127,7 +185,18 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
-        return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
+        return set().union(
+            *[conjunct.symbols() for conjunct in self.conjuncts]
+        )
+
+    def expression(self, variables, vectorized=False):
+        if not self.conjuncts:
+            return "np.True_" if vectorized else "True"
+        operator = " & " if vectorized else " and "
+        return "(" + operator.join(
+            conjunct.expression(variables, vectorized)
+            for conjunct in self.conjuncts
+        ) + ")"
 
 
 class Or(Sentence):
@@ -158,7 +227,18 @@ class Or(Sentence):
                             for disjunct in self.disjuncts])
 
     def symbols(self):
-        return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
+        return set().union(
+            *[disjunct.symbols() for disjunct in self.disjuncts]
+        )
+
+    def expression(self, variables, vectorized=False):
+        if not self.disjuncts:
+            return "np.False_" if vectorized else "False"
+        operator = " | " if vectorized else " or "
+        return "(" + operator.join(
+            disjunct.expression(variables, vectorized)
+            for disjunct in self.disjuncts
+        ) + ")"
 
 
 class Implication(Sentence):
@@ -191,6 +271,13 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def expression(self, variables, vectorized=False):
+        antecedent = self.antecedent.expression(variables, vectorized)
+        consequent = self.consequent.expression(variables, vectorized)
+        if vectorized:
+            return f"(~{antecedent} | {consequent})"
+        return f"(not {antecedent} or {consequent})"
+
 
 class Biconditional(Sentence):
     def __init__(self, left, right):
@@ -211,10 +298,7 @@ class Biconditional(Sentence):
         return f"Biconditional({self.left}, {self.right})"
 
     def evaluate(self, model):
-        return ((self.left.evaluate(model)
-                 and self.right.evaluate(model))
-                or (not self.left.evaluate(model)
-                    and not self.right.evaluate(model)))
+        return self.left.evaluate(model) == self.right.evaluate(model)
 
     def formula(self):
         left = Sentence.parenthesize(str(self.left))
@@ -224,9 +308,34 @@ class Biconditional(Sentence):
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
-
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+    def expression(self, variables, vectorized=False):
+        left = self.left.expression(variables, vectorized)
+        right = self.right.expression(variables, vectorized)
+        return f"({left} == {right})"
+
+
+def model_check(knowledge, query, backend="sat"):
+    """
+    Checks if knowledge base entails query.
+
+    The "sat" backend checks that knowledge ∧ ¬query is unsatisfiable
+    with the solver in sat.py. The others check every model in turn:
+    "enumerate" by evaluating the sentences, "compiled" with compiled
+    sentences over bitmask models, and "vectorized" with NumPy, a block
+    of models at a time.
+    """
+    if backend == "sat":
+        import sat
+        return sat.entails(knowledge, query)
+    elif backend in ("compiled", "vectorized"):
+        symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+        check = Implication(knowledge, query)
+        if backend == "compiled":
+            function = check.compile(symbols, bitmask=True)
+            return all(function(m) for m in range(2 ** len(symbols)))
+        return all(table.all() for table in check.truth_tables(symbols))
+    elif backend != "enumerate":
+        raise ValueError(f"unknown backend {backend!r}")
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
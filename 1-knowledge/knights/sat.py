@@ -0,0 +1,317 @@
+"""
+Satisfiability checking for logical sentences.
+
+Sentences are turned into conjunctive normal form with the Tseitin
+encoding, which gives every compound subsentence a variable of its own
+so the clauses grow linearly with the sentence rather than
+exponentially. The clauses are then solved by conflict-driven clause
+learning (CDCL): unit propagation over two watched literals per clause,
+learning a clause from each conflict and jumping back to the decision
+that caused it, and branching on the variables most involved in recent
+conflicts.
+
+Variables and literals follow the DIMACS convention: variables are
+numbered from 1, and literal -v is the negation of variable v.
+"""
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+# Activities fade by this factor per conflict, so recent ones weigh most
+DECAY = 0.95
+
+
+class Encoder:
+    """Tseitin encoding of sentences into clauses."""
+
+    def __init__(self):
+        self.clauses = []
+        self.variables = {}
+        self.count = 0
+        self.literals = {}
+
+    def variable(self):
+        """Returns a new variable."""
+        self.count += 1
+        return self.count
+
+    def symbol(self, name):
+        """Returns the variable of a symbol's name."""
+        if name not in self.variables:
+            self.variables[name] = self.variable()
+        return self.variables[name]
+
+    def encode(self, sentence):
+        """
+        Returns a literal that is true exactly when the sentence is,
+        adding the clauses that define it. Equal subsentences share one.
+        """
+        if sentence not in self.literals:
+            self.literals[sentence] = self.define(sentence)
+        return self.literals[sentence]
+
+    def define(self, sentence):
+        if isinstance(sentence, Symbol):
+            return self.symbol(sentence.name)
+        elif isinstance(sentence, Not):
+            return -self.encode(sentence.operand)
+        elif isinstance(sentence, And):
+            return self.conjunction(
+                [self.encode(conjunct) for conjunct in sentence.conjuncts]
+            )
+        elif isinstance(sentence, Or):
+            return -self.conjunction(
+                [-self.encode(disjunct) for disjunct in sentence.disjuncts]
+            )
+        elif isinstance(sentence, Implication):
+            return -self.conjunction([
+                self.encode(sentence.antecedent),
+                -self.encode(sentence.consequent),
+            ])
+        elif isinstance(sentence, Biconditional):
+            left = self.encode(sentence.left)
+            right = self.encode(sentence.right)
+            v = self.variable()
+            self.clauses.extend([
+                [-v, -left, right], [-v, left, -right],
+                [v, left, right], [v, -left, -right],
+            ])
+            return v
+        raise TypeError(f"cannot encode {type(sentence).__name__}")
+
+    def conjunction(self, literals):
+        """Returns a variable true exactly when all the literals are."""
+        v = self.variable()
+        for literal in literals:
+            self.clauses.append([-v, literal])
+        self.clauses.append([v] + [-literal for literal in literals])
+        return v
+
+
+class Solver:
+    """CDCL solver for clauses over variables 1..count."""
+
+    def __init__(self, count):
+        self.count = count
+        self.clauses = []
+        self.watches = {}
+        self.unsatisfiable = False
+
+        # Per variable: 1 if true, -1 if false, 0 if unassigned, with the
+        # decision level and clause (or None) that assigned it
+        self.values = [0] * (count + 1)
+        self.levels = [0] * (count + 1)
+        self.reasons = [None] * (count + 1)
+        self.activity = [0.0] * (count + 1)
+        self.phases = [-1] * (count + 1)
+        self.increment = 1.0
+
+        # Assigned literals in order, where each decision level starts on
+        # it, and how many have been propagated
+        self.trail = []
+        self.starts = []
+        self.propagated = 0
+
+    def value(self, literal):
+        """Returns 1 if a literal is true, -1 if false, 0 if unassigned."""
+        value = self.values[abs(literal)]
+        return value if literal > 0 else -value
+
+    def add_clause(self, literals):
+        """Adds a clause of the problem, before solving."""
+        clause = list(dict.fromkeys(literals))
+        if any(-literal in clause for literal in clause):
+            return
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            if self.value(clause[0]) == -1:
+                self.unsatisfiable = True
+            elif self.value(clause[0]) == 0:
+                self.assign(clause[0], None)
+        else:
+            self.watch(clause)
+
+    def watch(self, clause):
+        """Stores a clause, watching its first two literals."""
+        self.clauses.append(clause)
+        index = len(self.clauses) - 1
+        self.watches.setdefault(clause[0], []).append(index)
+        self.watches.setdefault(clause[1], []).append(index)
+        return index
+
+    def assign(self, literal, reason):
+        """Makes a literal true, because of a clause or as a decision."""
+        variable = abs(literal)
+        self.values[variable] = 1 if literal > 0 else -1
+        self.levels[variable] = len(self.starts)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """
+        Assigns the literals that unit clauses force.
+        Returns the index of a clause left false, or None.
+        """
+        while self.propagated < len(self.trail):
+            false = -self.trail[self.propagated]
+            self.propagated += 1
+            watchers = self.watches.get(false, [])
+            i = 0
+            while i < len(watchers):
+                index = watchers[i]
+                clause = self.clauses[index]
+
+                # Make the literal that became false the second watched one
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) == 1:
+                    i += 1
+                    continue
+
+                # Watch another literal that is not false, if any
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) != -1:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches.setdefault(clause[1], []).append(index)
+                        watchers[i] = watchers[-1]
+                        watchers.pop()
+                        break
+                else:
+                    if self.value(clause[0]) == -1:
+                        return index
+                    self.assign(clause[0], index)
+                    i += 1
+        return None
+
+    def analyze(self, conflict):
+        """
+        Learns a clause from a conflict by resolving it with the reasons
+        of the current level's assignments, back to the first unique
+        implication point. Returns the clause, its asserting literal
+        first, and the level to jump back to.
+        """
+        level = len(self.starts)
+        learned = []
+        seen = set()
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Resolve on the latest assignment involved
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+
+        # Watch the literal assigned last among the rest
+        learned.sort(key=lambda other: self.levels[abs(other)], reverse=True)
+        learned.insert(0, -literal)
+        back = self.levels[abs(learned[1])] if len(learned) > 1 else 0
+        return learned, back
+
+    def bump(self, variable):
+        """Raises a variable's activity, rescaling all if it gets large."""
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+
+    def backtrack(self, level):
+        """Undoes every assignment above a decision level."""
+        if len(self.starts) <= level:
+            return
+        start = self.starts[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = self.values[variable]
+            self.values[variable] = 0
+            self.reasons[variable] = None
+        del self.trail[start:]
+        del self.starts[level:]
+        self.propagated = len(self.trail)
+
+    def decide(self):
+        """
+        Returns the unassigned variable with the highest activity, as
+        a literal of the value it last had, or None if all are assigned.
+        """
+        best = None
+        for variable in range(1, self.count + 1):
+            if self.values[variable] == 0 and (
+                best is None or self.activity[variable] > self.activity[best]
+            ):
+                best = variable
+        if best is None:
+            return None
+        return best * self.phases[best]
+
+    def solve(self):
+        """
+        Returns a satisfying model, as a list of variable values indexed
+        by variable, or None if the clauses are unsatisfiable.
+        """
+        if self.unsatisfiable:
+            return None
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.starts:
+                    return None
+                learned, back = self.analyze(conflict)
+                self.backtrack(back)
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.assign(learned[0], self.watch(learned))
+                self.increment /= DECAY
+            else:
+                literal = self.decide()
+                if literal is None:
+                    return [value == 1 for value in self.values]
+                self.starts.append(len(self.trail))
+                self.assign(literal, None)
+
+
+def satisfiable(*sentences):
+    """
+    Returns a model (a dictionary from symbol names to truth values)
+    in which all the sentences are true, or None if there is none.
+    """
+    encoder = Encoder()
+    roots = [encoder.encode(sentence) for sentence in sentences]
+    solver = Solver(encoder.count)
+    for clause in encoder.clauses:
+        solver.add_clause(clause)
+    for root in roots:
+        solver.add_clause([root])
+    model = solver.solve()
+    if model is None:
+        return None
+    return {name: model[v] for name, v in encoder.variables.items()}
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query: if knowledge ∧ ¬query is
+    unsatisfiable.
+    """
+    return satisfiable(knowledge, Not(query)) is None
@@ -0,0 +1,90 @@
+"""
+Checks that compiled and vectorized sentences agree with evaluate, and
+that every model_check backend agrees, on random sentences.
+Run with `python -m pytest test_logic.py`.
+"""
+
+import random
+
+import pytest
+
+from logic import (And, Biconditional, Implication, Not, Or, Symbol,
+                   model_check)
+
+SYMBOLS = ["A", "B", "C", "D", "E"]
+
+
+def random_sentence(rng, depth):
+    """Returns a random sentence over SYMBOLS, empty connectives included."""
+    if depth == 0 or rng.random() < 0.2:
+        return Symbol(rng.choice(SYMBOLS))
+    kind = rng.randrange(5)
+    if kind == 0:
+        return Not(random_sentence(rng, depth - 1))
+    elif kind == 1:
+        return And(*[random_sentence(rng, depth - 1)
+                     for _ in range(rng.randint(0, 3))])
+    elif kind == 2:
+        return Or(*[random_sentence(rng, depth - 1)
+                    for _ in range(rng.randint(0, 3))])
+    elif kind == 3:
+        return Implication(random_sentence(rng, depth - 1),
+                           random_sentence(rng, depth - 1))
+    return Biconditional(random_sentence(rng, depth - 1),
+                         random_sentence(rng, depth - 1))
+
+
+def models():
+    """Yields (bitmask, tuple, dictionary) forms of every model."""
+    for m in range(2 ** len(SYMBOLS)):
+        values = tuple(bool(m >> i & 1) for i in range(len(SYMBOLS)))
+        yield m, values, dict(zip(SYMBOLS, values))
+
+
+def test_compiled_matches_evaluate():
+    rng = random.Random(0)
+    for _ in range(500):
+        sentence = random_sentence(rng, 4)
+        by_tuple = sentence.compile(SYMBOLS)
+        by_bitmask = sentence.compile(SYMBOLS, bitmask=True)
+        for m, values, model in models():
+            expected = sentence.evaluate(model)
+            assert by_tuple(values) is expected
+            assert by_bitmask(m) is expected
+
+
+def test_vectorized_matches_evaluate():
+    pytest.importorskip("numpy")
+    rng = random.Random(1)
+    for _ in range(500):
+        sentence = random_sentence(rng, 4)
+        (table,) = sentence.truth_tables(SYMBOLS)
+        assert table.dtype == bool
+        assert list(table) == [
+            sentence.evaluate(model) for _, _, model in models()
+        ]
+
+
+def test_empty_connectives_vectorized():
+    pytest.importorskip("numpy")
+    a = Symbol("A")
+    (table,) = Not(And()).truth_tables(["A"])
+    assert list(table) == [False, False]
+    (table,) = Implication(And(), a).truth_tables(["A"])
+    assert list(table) == [False, True]
+    (table,) = Or().truth_tables(["A"])
+    assert list(table) == [False, False]
+
+
+def test_backends_agree():
+    pytest.importorskip("numpy")
+    rng = random.Random(2)
+    for _ in range(300):
+        knowledge = And(*[random_sentence(rng, 3)
+                          for _ in range(rng.randint(0, 3))])
+        query = random_sentence(rng, 2)
+        results = {
+            backend: model_check(knowledge, query, backend=backend)
+            for backend in ("enumerate", "compiled", "vectorized", "sat")
+        }
+        assert len(set(results.values())) == 1, results
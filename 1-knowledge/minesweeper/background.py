@@ -0,0 +1,71 @@
+"""
+Background AI work for the pygame runners.
+
+The AI runs on a single worker thread, and the game loop hands off to it
+once a frame without waiting. The runner asks Python to switch threads
+every SWITCH_INTERVAL seconds instead of every 5ms when it starts, so the
+loop wakes up on time for each frame even when the AI never blocks.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+# Seconds a thread may hold the interpreter while another one waits
+SWITCH_INTERVAL = 0.0005
+
+
+class Worker:
+    """Runs one call at a time in a background thread."""
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.future = None
+
+    def busy(self):
+        """Returns True from a submit until poll reports it done."""
+        return self.future is not None
+
+    def submit(self, function, *args):
+        """
+        Starts `function(*args)` in the background. Calls submitted while
+        another runs are queued, and run in order.
+        """
+        self.future = self.executor.submit(function, *args)
+
+    def poll(self):
+        """
+        Returns (True, result) once the latest call is done, raising its
+        exception if it failed, or (False, None) while it still runs.
+        """
+        if self.future is None or not self.future.done():
+            return False, None
+        future, self.future = self.future, None
+        return True, future.result()
+
+    def step(self, function, *args):
+        """
+        Advances background work by one frame: submits `function(*args)`
+        if nothing is running, then polls as poll does.
+        """
+        if self.future is None:
+            self.submit(function, *args)
+        return self.poll()
+
+    def cancel(self):
+        """Forgets the latest call, whose result is no longer wanted."""
+        self.future = None
+
+
+def hand_off(worker, ai, game, move, revealed):
+    """
+    Does one frame of handing moves to the AI: collects whatever the worker
+    has finished, then reveals `move`, if any, and has the AI take it in
+    in the background. Returns True if `move` was a mine.
+    """
+    worker.poll()
+    if move is None:
+        return False
+    if game.is_mine(move):
+        return True
+    revealed.add(move)
+    worker.submit(ai.add_knowledge, move, game.nearby_mines(move))
+    return False
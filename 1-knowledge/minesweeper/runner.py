@@ -2,12 +2,16 @@ import pygame
 import sys
 import time
 
+from background import SWITCH_INTERVAL, Worker, hand_off
 from minesweeper import Minesweeper, MinesweeperAI
 
 HEIGHT = 8
 WIDTH = 8
 MINES = 8
 
+# Frames drawn per second, while the AI thinks too
+FPS = 60
+
 # Colors
 BLACK = (0, 0, 0)
 GRAY = (180, 180, 180)
@@ -41,6 +45,12 @@ mine = pygame.transform.scale(mine, (cell_size, cell_size))
 game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
 ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
 
+# The AI takes in revealed cells in a background thread, one at a time,
+# so the window keeps responding while it reasons
+sys.setswitchinterval(SWITCH_INTERVAL)
+worker = Worker()
+clock = pygame.time.Clock()
+
 # Keep track of revealed cells, flagged cells, and if a mine was hit
 revealed = set()
 flags = set()
@@ -154,6 +164,8 @@ while True:
 
     # Display text
     text = "Lost" if lost else "Won" if game.mines == flags else ""
+    if not text and worker.busy():
+        text = "Thinking" + "." * (pygame.time.get_ticks() // 400 % 3 + 1)
     text = mediumFont.render(text, True, WHITE)
     textRect = text.get_rect()
     textRect.center = ((5 / 6) * width, (2 / 3) * height)
@@ -179,7 +191,7 @@ while True:
         mouse = pygame.mouse.get_pos()
 
         # If AI button clicked, make an AI move
-        if aiButton.collidepoint(mouse) and not lost:
+        if aiButton.collidepoint(mouse) and not lost and not worker.busy():
             move = ai.make_safe_move()
             if move is None:
                 move = ai.make_random_move()
@@ -199,6 +211,7 @@ while True:
             revealed = set()
             flags = set()
             lost = False
+            worker.cancel()
             continue
 
         # User-made move
@@ -210,13 +223,10 @@ while True:
                             and (i, j) not in revealed):
                         move = (i, j)
 
-    # Make move and update AI knowledge
-    if move:
-        if game.is_mine(move):
-            lost = True
-        else:
-            nearby = game.nearby_mines(move)
-            revealed.add(move)
-            ai.add_knowledge(move, nearby)
+    # Make move and hand it to the AI; its knowledge is only read once it
+    # has taken in every move
+    if hand_off(worker, ai, game, move, revealed):
+        lost = True
 
     pygame.display.flip()
+    clock.tick(FPS)
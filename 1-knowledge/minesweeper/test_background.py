@@ -0,0 +1,91 @@
+"""
+Checks that handing moves to the AI in the background keeps frames on
+time while it takes them in. Run with `python -m pytest
+test_background.py`; set STRICT_FRAMES=1 to also fail on any single late
+frame.
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import pytest
+
+from background import SWITCH_INTERVAL, Worker, hand_off
+from minesweeper import Minesweeper, MinesweeperAI
+
+FPS = 60
+FRAME = 1 / FPS
+
+# Seconds the stub AI computes for, without ever releasing the interpreter
+THINK_SECONDS = 1.0
+
+
+@pytest.fixture
+def switching():
+    """Switches threads as the runner does, restoring the interval after."""
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(SWITCH_INTERVAL)
+    yield
+    sys.setswitchinterval(interval)
+
+
+class SlowAI(MinesweeperAI):
+    """An AI that spins in Python for THINK_SECONDS on every move."""
+
+    def add_knowledge(self, cell, count):
+        end = time.perf_counter() + THINK_SECONDS
+        while time.perf_counter() < end:
+            pass
+        super().add_knowledge(cell, count)
+
+
+def frame_times(step):
+    """Calls `step` once a frame at FPS until it returns True."""
+    frames = []
+    last = time.perf_counter()
+    while not step():
+        time.sleep(max(0, last + FRAME - time.perf_counter()))
+        now = time.perf_counter()
+        frames.append(now - last)
+        last = now
+    return frames
+
+
+def safe_cell(game):
+    """Returns the first cell of `game` that is not a mine."""
+    return next((i, j) for i in range(game.height) for j in range(game.width)
+                if not game.is_mine((i, j)))
+
+
+def test_hand_off_keeps_frames_on_time(switching):
+    worker = Worker()
+    game = Minesweeper(height=8, width=8, mines=8)
+    ai = SlowAI(height=8, width=8)
+    revealed = set()
+    move = safe_cell(game)
+    assert not hand_off(worker, ai, game, move, revealed)
+
+    def step():
+        hand_off(worker, ai, game, None, revealed)
+        return not worker.busy()
+
+    frames = frame_times(step)
+    assert revealed == {move}
+    assert move in ai.moves_made
+    assert len(frames) >= THINK_SECONDS * FPS * 0.8
+    assert statistics.median(frames) < FRAME * 1.15
+    if os.environ.get("STRICT_FRAMES"):
+        assert max(frames) < FRAME * 2
+
+
+def test_hand_off_reports_mines():
+    worker = Worker()
+    game = Minesweeper(height=8, width=8, mines=8)
+    ai = MinesweeperAI(height=8, width=8)
+    revealed = set()
+    mine = next(iter(game.mines))
+    assert hand_off(worker, ai, game, mine, revealed)
+    assert revealed == set()
+    assert not worker.busy()
@@ -0,0 +1,190 @@
+"""
+Headless Nim tournament between AI agents.
+
+Every pair of agents plays a number of games, each agent moving first in
+half of them, spread over a process pool. Prints each pairing's win
+rates, then each agent's moves per second and the percentiles of the
+time it took per move. The Q-learning agent is trained once, before the
+games, and plays without exploring.
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import itertools
+import random
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from nim import Nim, train
+
+# The trained NimAI of the current process, set up by init_worker
+q_ai = None
+
+
+def init_worker(ai):
+    global q_ai
+    q_ai = ai
+
+
+def optimal_action(piles):
+    """
+    Returns a winning action for misère Nim (whoever takes the last
+    object loses) if there is one, else takes one object from the
+    largest pile.
+    """
+    nim_sum = functools.reduce(lambda a, b: a ^ b, piles)
+    large = [i for i, pile in enumerate(piles) if pile > 1]
+
+    # Once no pile has more than one object, leave an odd number of them
+    if not large:
+        return next(i for i, pile in enumerate(piles) if pile), 1
+
+    # With one large pile left, shrink it to leave an odd number of ones
+    if len(large) == 1:
+        i = large[0]
+        ones = sum(1 for pile in piles if pile == 1)
+        return i, piles[i] - (1 if ones % 2 == 0 else 0)
+
+    # Otherwise play as in normal Nim, leaving a nim-sum of zero
+    for i, pile in enumerate(piles):
+        if pile ^ nim_sum < pile:
+            return i, pile - (pile ^ nim_sum)
+    return max(range(len(piles)), key=lambda i: piles[i]), 1
+
+
+def random_agent(rng):
+    """Takes a random number of objects from a random pile."""
+    return lambda piles: rng.choice(sorted(Nim.available_actions(piles)))
+
+
+def q_agent(rng):
+    """Plays the best action of the trained Q-learning AI."""
+    return lambda piles: q_ai.choose_action(piles, epsilon=False)
+
+
+# Agents by name, as functions of a random number generator returning a
+# function from piles to actions
+AGENTS = {
+    "random": random_agent,
+    "optimal": lambda rng: optimal_action,
+    "q": q_agent,
+}
+
+
+def play_games(first, second, games, seed):
+    """
+    Plays `games` games of agent `first` moving first against `second`.
+    Returns the number of games each won, and lists of the seconds each
+    took for each of its moves.
+    """
+    rng = random.Random(seed)
+    agents = [AGENTS[first](rng), AGENTS[second](rng)]
+    wins = [0, 0]
+    latencies = [[], []]
+
+    for _ in range(games):
+        game = Nim()
+        while game.winner is None:
+            start = time.perf_counter()
+            action = agents[game.player](game.piles.copy())
+            latencies[game.player].append(time.perf_counter() - start)
+            game.move(action)
+        wins[game.winner] += 1
+
+    return wins[0], wins[1], latencies[0], latencies[1]
+
+
+def entrants(names):
+    """
+    Returns a label for each agent in a run, numbering repeated agents
+    (q, q#2) so an agent can play itself.
+    """
+    labels = []
+    for i, name in enumerate(names):
+        repeats = names[:i].count(name)
+        labels.append(f"{name}#{repeats + 1}" if repeats else name)
+    return labels
+
+
+def percentile(values, fraction):
+    """Returns the value at a fraction of the way through sorted values."""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Play Nim agents against each other."
+    )
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS),
+                        default=["random", "optimal", "q"])
+    parser.add_argument("--games", type=int, default=1000,
+                        help="games per pairing")
+    parser.add_argument("--train", type=int, default=10000,
+                        help="training games for the Q-learning agent")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes (default: CPUs)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if len(args.agents) < 2:
+        parser.error("at least two agents are needed")
+    labels = entrants(args.agents)
+
+    # Train quietly: train prints a line per game
+    ai = None
+    if "q" in args.agents:
+        random.seed(args.seed)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ai = train(args.train)
+
+    # Each pairing plays half its games with either agent moving first
+    matches = []
+    for a, b in itertools.combinations(range(len(labels)), 2):
+        matches.append((a, b, (args.games + 1) // 2))
+        matches.append((b, a, args.games // 2))
+
+    with ProcessPoolExecutor(max_workers=args.workers,
+                             initializer=init_worker,
+                             initargs=(ai,)) as executor:
+        results = list(executor.map(
+            play_games,
+            [args.agents[first] for first, _, _ in matches],
+            [args.agents[second] for _, second, _ in matches],
+            [games for _, _, games in matches],
+            [args.seed + i for i in range(len(matches))],
+        ))
+
+    records = {}
+    latencies = {label: [] for label in labels}
+    for (first, second, _), (first_wins, second_wins, first_times,
+                             second_times) in zip(matches, results):
+        pair = tuple(sorted((first, second)))
+        wins = records.setdefault(pair, {first: 0, second: 0})
+        wins[first] += first_wins
+        wins[second] += second_wins
+        latencies[labels[first]].extend(first_times)
+        latencies[labels[second]].extend(second_times)
+
+    print(f"{'Pairing':<25}{'Wins':>8}{'Losses':>8}")
+    for (a, b), wins in records.items():
+        games = sum(wins.values())
+        print(f"{labels[a] + ' vs ' + labels[b]:<25}{wins[a] / games:>8.1%}"
+              f"{wins[b] / games:>8.1%}")
+
+    print()
+    print(f"{'Agent':<10}{'Moves':>8}{'Moves/s':>12}"
+          f"{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label in labels:
+        seconds = sorted(latencies[label])
+        if not seconds:
+            continue
+        print(f"{label:<10}{len(seconds):>8}"
+              f"{len(seconds) / sum(seconds):>12,.0f}"
+              + "".join(f"{percentile(seconds, q) * 1e3:>10.3f}"
+                        for q in (0.5, 0.9, 0.99, 1)))
+
+
+if __name__ == "__main__":
+    main()